@@ -10,9 +10,18 @@ Simple CLI demo that calls functions directly from src/albumentations_mcp/server
 from __future__ import annotations
 
 import argparse
+import codecs
+import functools
 import json
 import sys
+from collections.abc import Callable
 from pathlib import Path
+from types import ModuleType
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast JSON backend
+    orjson = None
 
 
 # Ensure src/ is on sys.path for local usage (src layout)
@@ -27,69 +36,94 @@ def _ensure_src_on_path() -> None:
 _ensure_src_on_path()
 
 
-# Import server functions directly (no MCP runtime)
-try:
-    from albumentations_mcp.server import (
-        augment_image,
-        augmentation_parser,
-        available_transforms_examples,
-        compose_preset,
-        error_handler,
-        explain_effects,
-        get_pipeline_status,
-        get_quick_transform_reference,
-        list_available_presets,
-        list_available_transforms,
-        load_image_for_processing,
-        policy_presets,
-        set_default_seed,
-        transforms_guide,
-        troubleshooting_common_issues,
-        validate_prompt,
-        vision_verification,
-    )
-except Exception as e:  # pragma: no cover - import-time guard for local runs
-    print(f"Failed to import server functions: {e}", file=sys.stderr)
-    raise SystemExit(1)
+# Import the server module lazily so --help and argparse errors stay fast;
+# it pulls in albumentations, PIL, numpy and the MCP runtime.
+@functools.lru_cache(maxsize=1)
+def _server() -> ModuleType:
+    try:
+        from albumentations_mcp import server
+    except Exception as e:  # pragma: no cover - import-time guard for local runs
+        print(f"Failed to import server functions: {e}", file=sys.stderr)
+        raise SystemExit(1) from e
+    return server
+
+
+def _json_default(obj: object) -> str:
+    # orjson handles datetimes natively; stringify paths and leave the rest
+    # to the TypeError fallback in _print_json
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdout_encoding() -> str:
+    """Return the normalized codec name stdout encodes text with."""
+    encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return "utf-8"
+
+
+def _write_bytes(*chunks: bytes) -> None:
+    """Write bytes already in stdout's encoding, bypassing the text layer."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        encoding = _stdout_encoding()
+        for chunk in chunks:
+            sys.stdout.write(chunk.decode(encoding, "replace"))
+        return
+    # Keep ordering with anything already written through the text layer
+    sys.stdout.flush()
+    for chunk in chunks:
+        buffer.write(chunk)
+    buffer.flush()
+
+
+def _utf8_for_stdout(data: bytes) -> bytes:
+    """Re-encode UTF-8 bytes for stdout, replacing what its codec lacks."""
+    encoding = _stdout_encoding()
+    if encoding == "utf-8":
+        return data
+    return data.decode("utf-8").encode(encoding, "replace")
 
 
 def _print_json(obj: object) -> None:
     try:
-        print(json.dumps(obj, indent=2, ensure_ascii=False))
+        if orjson is not None:
+            _write_bytes(
+                _utf8_for_stdout(
+                    orjson.dumps(
+                        obj,
+                        default=_json_default,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                    ),
+                ),
+                b"\n",
+            )
+        else:
+            _print_text(
+                json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default),
+            )
     except TypeError:
-        # Fallback for non-serializable objects
+        # Fallback for non-serializable objects (orjson.JSONEncodeError included)
         print(str(obj))
 
 
-def _print_json_or_text(maybe_json: str) -> None:
-    try:
-        parsed = json.loads(maybe_json)
-        _print_json(parsed)
-    except Exception:
-        print(maybe_json)
+def _print_text(text: str | bytes) -> None:
+    """Print a (possibly very large) string without going through print()."""
+    if isinstance(text, bytes):
+        data = _utf8_for_stdout(text)
+    else:
+        data = text.encode(_stdout_encoding(), "replace")
+    # Separate newline write avoids copying a multi-MB payload to append b"\n"
+    _write_bytes(data, b"\n")
 
 
 # Subcommand handlers
 def cmd_augment(args: argparse.Namespace) -> int:
-    # Enforce mutual exclusivity
-    input_count = sum(
-        bool(x) for x in [args.image_path, args.image_b64, args.session_id]
-    )
-    if input_count != 1:
-        print(
-            "Error: Provide exactly one of --image-path, --image-b64, or --session-id",
-            file=sys.stderr,
-        )
-        return 2
-
-    if bool(args.prompt) == bool(args.preset):
-        print(
-            "Error: Provide either --prompt or --preset (but not both)",
-            file=sys.stderr,
-        )
-        return 2
-
-    result = augment_image(
+    # Exactly one input and one of --prompt/--preset are enforced by argparse
+    result = _server().augment_image(
         image_path=args.image_path or "",
         image_b64=args.image_b64 or "",
         session_id=args.session_id or "",
@@ -99,81 +133,85 @@ def cmd_augment(args: argparse.Namespace) -> int:
         output_dir=args.output_dir,
     )
     # augment_image returns a string message
-    print(result)
+    _print_text(result)
     return 0
 
 
 def cmd_validate(args: argparse.Namespace) -> int:
-    res = validate_prompt(args.prompt)
+    res = _server().validate_prompt(args.prompt)
     _print_json(res)
     return 0
 
 
 def cmd_transforms(_: argparse.Namespace) -> int:
-    res = list_available_transforms()
+    res = _server().list_available_transforms()
     _print_json(res)
     return 0
 
 
 def cmd_presets(_: argparse.Namespace) -> int:
-    res = list_available_presets()
+    res = _server().list_available_presets()
     _print_json(res)
     return 0
 
 
 def cmd_load(args: argparse.Namespace) -> int:
-    res = load_image_for_processing(args.image_source)
-    print(res)
+    res = _server().load_image_for_processing(args.image_source)
+    _print_text(res)
     return 0
 
 
 def cmd_set_seed(args: argparse.Namespace) -> int:
     # If --seed is omitted, clear the default seed
     seed = args.seed
-    res = set_default_seed(seed)
+    res = _server().set_default_seed(seed)
     _print_json(res)
     return 0
 
 
 def cmd_status(_: argparse.Namespace) -> int:
-    res = get_pipeline_status()
+    res = _server().get_pipeline_status()
     _print_json(res)
     return 0
 
 
 def cmd_quick_ref(_: argparse.Namespace) -> int:
-    res = get_quick_transform_reference()
+    res = _server().get_quick_transform_reference()
     _print_json(res)
     return 0
 
 
 def cmd_transforms_guide(_: argparse.Namespace) -> int:
-    res = transforms_guide()  # returns JSON string
-    _print_json_or_text(res)
+    res = _server().transforms_guide()  # indented JSON string, printed as-is
+    _print_text(res)
     return 0
 
 
 def cmd_policy_presets(_: argparse.Namespace) -> int:
-    res = policy_presets()  # returns JSON string
-    _print_json_or_text(res)
+    res = _server().policy_presets()  # indented JSON string, printed as-is
+    _print_text(res)
     return 0
 
 
 def cmd_examples(_: argparse.Namespace) -> int:
-    res = available_transforms_examples()  # returns JSON string
-    _print_json_or_text(res)
+    # Indented JSON string, printed as-is
+    res = _server().available_transforms_examples()
+    _print_text(res)
     return 0
 
 
 def cmd_troubleshooting(_: argparse.Namespace) -> int:
-    res = troubleshooting_common_issues()  # returns JSON string
-    _print_json_or_text(res)
+    # Indented JSON string, printed as-is
+    res = _server().troubleshooting_common_issues()
+    _print_text(res)
     return 0
 
 
 def cmd_compose_preset(args: argparse.Namespace) -> int:
-    text = compose_preset(args.base, args.tweak_note or "", args.output_format)
-    print(text)
+    text = _server().compose_preset(
+        args.base, args.tweak_note or "", args.output_format
+    )
+    _print_text(text)
     return 0
 
 
@@ -181,54 +219,59 @@ def cmd_explain_effects(args: argparse.Namespace) -> int:
     pipeline_json: str
     if args.pipeline_json_file:
         p = Path(args.pipeline_json_file)
-        pipeline_json = p.read_text(encoding="utf-8")
+        # Plain byte read + one decode; skips the line-aware text I/O layer
+        pipeline_json = p.read_bytes().decode("utf-8")
     else:
         pipeline_json = args.pipeline_json
-    text = explain_effects(pipeline_json, args.image_context or "")
-    print(text)
+    text = _server().explain_effects(pipeline_json, args.image_context or "")
+    _print_text(text)
     return 0
 
 
 def cmd_augmentation_parser(args: argparse.Namespace) -> int:
     # This returns a prompt (string) for LLM parsing guidance; we just print it
-    text = augmentation_parser(args.user_prompt)
-    print(text)
+    text = _server().augmentation_parser(args.user_prompt)
+    _print_text(text)
     return 0
 
 
 def cmd_vision_verification(args: argparse.Namespace) -> int:
-    text = vision_verification(
+    text = _server().vision_verification(
         args.original_image_path,
         args.augmented_image_path,
         args.requested_transforms,
     )
-    print(text)
+    _print_text(text)
     return 0
 
 
 def cmd_error_handler(args: argparse.Namespace) -> int:
-    text = error_handler(args.error_type, args.error_message, args.user_context or "")
-    print(text)
+    text = _server().error_handler(
+        args.error_type, args.error_message, args.user_context or ""
+    )
+    _print_text(text)
     return 0
 
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
-        prog="albumentations-mcp-demo",
-        description="CLI demo: call functions from albumentations_mcp.server directly",
-    )
+# Subparser builders: each configures exactly one subcommand so that main()
+# only pays for the parser the user actually selected.
+SubParsers = argparse._SubParsersAction
+
+_PRESET_CHOICES = ("segmentation", "portrait", "lowlight")
+_FMT_CHOICES = ("json", "yaml", "text")
 
-    sub = parser.add_subparsers(dest="command", required=True)
 
-    # augment
+def _build_augment(sub: SubParsers) -> None:
     p_aug = sub.add_parser("augment", help="Run augment_image on an input")
-    p_aug.add_argument("--image-path", help="Path to an image file")
-    p_aug.add_argument("--image-b64", help="Base64-encoded image data")
-    p_aug.add_argument("--session-id", help="Existing session ID from load")
-    p_aug.add_argument("--prompt", help="Natural language prompt for transforms")
-    p_aug.add_argument(
+    inputs = p_aug.add_mutually_exclusive_group(required=True)
+    inputs.add_argument("--image-path", help="Path to an image file")
+    inputs.add_argument("--image-b64", help="Base64-encoded image data")
+    inputs.add_argument("--session-id", help="Existing session ID from load")
+    recipe = p_aug.add_mutually_exclusive_group(required=True)
+    recipe.add_argument("--prompt", help="Natural language prompt for transforms")
+    recipe.add_argument(
         "--preset",
-        choices=["segmentation", "portrait", "lowlight"],
+        choices=_PRESET_CHOICES,
         help="Preset name (mutually exclusive with --prompt)",
     )
     p_aug.add_argument("--seed", type=int, help="Random seed for reproducibility")
@@ -238,20 +281,24 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_aug.set_defaults(func=cmd_augment)
 
-    # validate
+
+def _build_validate(sub: SubParsers) -> None:
     p_val = sub.add_parser("validate", help="Call validate_prompt and show results")
     p_val.add_argument("--prompt", required=True, help="Prompt to validate")
     p_val.set_defaults(func=cmd_validate)
 
-    # transforms
+
+def _build_transforms(sub: SubParsers) -> None:
     p_tr = sub.add_parser("transforms", help="List available transforms")
     p_tr.set_defaults(func=cmd_transforms)
 
-    # presets
+
+def _build_presets(sub: SubParsers) -> None:
     p_pr = sub.add_parser("presets", help="List available presets")
     p_pr.set_defaults(func=cmd_presets)
 
-    # load image (session)
+
+def _build_load(sub: SubParsers) -> None:
     p_load = sub.add_parser(
         "load",
         help="Load image (path/URL/base64) and get a session_id",
@@ -263,7 +310,8 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_load.set_defaults(func=cmd_load)
 
-    # set default seed
+
+def _build_set_seed(sub: SubParsers) -> None:
     p_seed = sub.add_parser("set-seed", help="Set or clear the default seed")
     p_seed.add_argument(
         "--seed",
@@ -272,28 +320,40 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_seed.set_defaults(func=cmd_set_seed)
 
-    # status
+
+def _build_status(sub: SubParsers) -> None:
     p_st = sub.add_parser("status", help="Show pipeline status and registered hooks")
     p_st.set_defaults(func=cmd_status)
 
-    # quick reference
+
+def _build_quick_ref(sub: SubParsers) -> None:
     p_qr = sub.add_parser("quick-ref", help="Condensed transform keywords reference")
     p_qr.set_defaults(func=cmd_quick_ref)
 
-    # resource-like data (JSON strings)
+
+# resource-like data (JSON strings)
+def _build_transforms_guide(sub: SubParsers) -> None:
     p_tg = sub.add_parser("transforms-guide", help="JSON guide for transforms")
     p_tg.set_defaults(func=cmd_transforms_guide)
 
+
+def _build_policy_presets(sub: SubParsers) -> None:
     p_pp = sub.add_parser("policy-presets", help="JSON of built-in presets")
     p_pp.set_defaults(func=cmd_policy_presets)
 
+
+def _build_examples(sub: SubParsers) -> None:
     p_ex = sub.add_parser("examples", help="Examples and usage patterns")
     p_ex.set_defaults(func=cmd_examples)
 
+
+def _build_troubleshooting(sub: SubParsers) -> None:
     p_tb = sub.add_parser("troubleshooting", help="Common issues and solutions")
     p_tb.set_defaults(func=cmd_troubleshooting)
 
-    # prompt-generating helpers
+
+# prompt-generating helpers
+def _build_compose_preset(sub: SubParsers) -> None:
     p_cp = sub.add_parser(
         "compose-preset",
         help="Generate a policy prompt from a preset",
@@ -301,18 +361,20 @@ def build_parser() -> argparse.ArgumentParser:
     p_cp.add_argument(
         "--base",
         required=True,
-        choices=["segmentation", "portrait", "lowlight"],
+        choices=_PRESET_CHOICES,
         help="Base preset name",
     )
     p_cp.add_argument("--tweak-note", help="Optional tweaks/notes to apply")
     p_cp.add_argument(
         "--output-format",
         default="json",
-        choices=["json", "yaml", "text"],
+        choices=_FMT_CHOICES,
         help="Output format for the generated policy prompt",
     )
     p_cp.set_defaults(func=cmd_compose_preset)
 
+
+def _build_explain_effects(sub: SubParsers) -> None:
     p_ee = sub.add_parser(
         "explain-effects",
         help="Generate natural-language explanation of a pipeline JSON",
@@ -326,6 +388,8 @@ def build_parser() -> argparse.ArgumentParser:
     p_ee.add_argument("--image-context", help="Optional image/use-case context")
     p_ee.set_defaults(func=cmd_explain_effects)
 
+
+def _build_augmentation_parser(sub: SubParsers) -> None:
     p_ap = sub.add_parser(
         "augmentation-parser",
         help="Generate a parsing prompt for a user request",
@@ -337,6 +401,8 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_ap.set_defaults(func=cmd_augmentation_parser)
 
+
+def _build_vision_verification(sub: SubParsers) -> None:
     p_vv = sub.add_parser(
         "vision-verification",
         help="Generate a verification prompt for comparing two images",
@@ -358,6 +424,8 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_vv.set_defaults(func=cmd_vision_verification)
 
+
+def _build_error_handler(sub: SubParsers) -> None:
     p_err = sub.add_parser(
         "error-handler",
         help="Generate helpful error messaging text",
@@ -374,17 +442,63 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_err.set_defaults(func=cmd_error_handler)
 
+
+# Command name -> subparser builder, in --help display order
+COMMANDS: dict[str, Callable[[SubParsers], None]] = {
+    "augment": _build_augment,
+    "validate": _build_validate,
+    "transforms": _build_transforms,
+    "presets": _build_presets,
+    "load": _build_load,
+    "set-seed": _build_set_seed,
+    "status": _build_status,
+    "quick-ref": _build_quick_ref,
+    "transforms-guide": _build_transforms_guide,
+    "policy-presets": _build_policy_presets,
+    "examples": _build_examples,
+    "troubleshooting": _build_troubleshooting,
+    "compose-preset": _build_compose_preset,
+    "explain-effects": _build_explain_effects,
+    "augmentation-parser": _build_augmentation_parser,
+    "vision-verification": _build_vision_verification,
+    "error-handler": _build_error_handler,
+}
+
+
+@functools.lru_cache(maxsize=len(COMMANDS) + 1)
+def build_parser(command: str | None = None) -> argparse.ArgumentParser:
+    """Build the CLI parser.
+
+    When ``command`` names a known subcommand only that subparser is built;
+    otherwise every subcommand is registered (needed for top-level --help).
+    Parsers are cached per command and reused across ``main()`` calls, so
+    callers must not add arguments to the returned parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="albumentations-mcp-demo",
+        description="CLI demo: call functions from albumentations_mcp.server directly",
+    )
+
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    if command in COMMANDS:
+        COMMANDS[command](sub)
+    else:
+        for builder in COMMANDS.values():
+            builder(sub)
+
     return parser
 
 
 def main(argv: list[str] | None = None) -> int:
-    parser = build_parser()
+    if argv is None:
+        argv = sys.argv[1:]
+    command = argv[0] if argv and argv[0] in COMMANDS else None
+    parser = build_parser(command)
     args = parser.parse_args(argv)
-    func = getattr(args, "func", None)
-    if not func:
-        parser.print_help()
-        return 2
-    return int(func(args))
+    # Subcommands are required and every subparser sets func, so argparse
+    # has already exited if no command was given.
+    return int(args.func(args))
 
 
 if __name__ == "__main__":  # pragma: no cover
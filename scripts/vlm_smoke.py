@@ -9,18 +9,17 @@ Requires:
   - VLM config set via VLM_CONFIG_PATH pointing to config/vlm.json
 
 This script loads the VLM config, constructs the GoogleGeminiClient, generates
-an image for the given prompt, and writes it to OUTPUT_DIR/vlm_tests.
+an image for the given prompt, and writes it to OUTPUT_DIR/vlm_tests
+(PNG by default, or WebP with OUTPUT_FORMAT=webp).
 """
 
 from __future__ import annotations
 
 import os
 import sys
-from datetime import datetime
+import time
 from pathlib import Path
 
-from PIL import Image
-
 from albumentations_mcp.vlm.config import load_vlm_config, get_vlm_api_key
 from albumentations_mcp.vlm.google_gemini import GoogleGeminiClient
 
@@ -46,15 +45,18 @@ def main() -> int:
 
     client = GoogleGeminiClient(model=model, api_key=api_key)
 
-    # Placeholder input image (not used for generation in this MVP)
-    temp_img = Image.new("RGB", (16, 16), color=(0, 0, 0))
-    out = client.apply(temp_img, prompt)
+    out = client.generate(prompt)
 
     out_dir = Path(os.getenv("OUTPUT_DIR", "outputs")) / "vlm_tests"
     out_dir.mkdir(parents=True, exist_ok=True)
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    out_path = out_dir / f"gemini_preview_{ts}.png"
-    out.save(out_path)
+    ts = time.strftime("%Y%m%d_%H%M%S")
+    # Smoke-test artifacts favour fast encoding over file size
+    if os.getenv("OUTPUT_FORMAT", "png").lower() == "webp":
+        out_path = out_dir / f"gemini_preview_{ts}.webp"
+        out.save(out_path, "WEBP", quality=90, method=0)
+    else:
+        out_path = out_dir / f"gemini_preview_{ts}.png"
+        out.save(out_path, "PNG", compress_level=1)
     print(f"Saved: {out_path}")
     return 0
 
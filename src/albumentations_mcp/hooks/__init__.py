@@ -8,6 +8,7 @@ import asyncio
 import logging
 from abc import ABC, abstractmethod
 from collections.abc import Callable
+from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union
 
@@ -52,20 +53,14 @@ class HookContext(BaseModel):
     )
 
 
+@dataclass(slots=True)
 class HookResult:
     """Result of hook execution."""
 
-    def __init__(
-        self,
-        success: bool = True,
-        context: HookContext | None = None,
-        error: str | None = None,
-        should_continue: bool = True,
-    ):
-        self.success = success
-        self.context = context
-        self.error = error
-        self.should_continue = should_continue
+    success: bool = True
+    context: HookContext | None = None
+    error: str | None = None
+    should_continue: bool = True
 
 
 class BaseHook(ABC):
@@ -87,30 +82,35 @@ class HookRegistry:
     """Registry for managing and executing hooks."""
 
     def __init__(self):
-        self._hooks: dict[HookStage, list[BaseHook]] = {
-            stage: [] for stage in HookStage
+        # Each stage holds an immutable snapshot that is replaced on
+        # (un)registration, so execution iterates it without copying and is
+        # unaffected by hooks registered mid-stage
+        self._hooks: dict[HookStage, tuple[BaseHook, ...]] = {
+            stage: () for stage in HookStage
         }
 
     def register_hook(self, stage: HookStage, hook: BaseHook) -> None:
         """Register a hook for a specific stage."""
-        self._hooks[stage].append(hook)
-        logger.debug(f"Registered hook {hook} for stage {stage}")
+        self._hooks[stage] = (*self._hooks[stage], hook)
+        logger.debug("Registered hook %s for stage %s", hook, stage)
 
     def unregister_hook(self, stage: HookStage, hook_name: str) -> bool:
         """Unregister a hook by name."""
         hooks = self._hooks[stage]
         for i, hook in enumerate(hooks):
             if hook.name == hook_name:
-                del hooks[i]
+                self._hooks[stage] = (*hooks[:i], *hooks[i + 1 :])
                 logger.debug(
-                    f"Unregistered hook {hook_name} from stage {stage}",
+                    "Unregistered hook %s from stage %s",
+                    hook_name,
+                    stage,
                 )
                 return True
         return False
 
     def get_hooks(self, stage: HookStage) -> list[BaseHook]:
         """Get all hooks for a stage."""
-        return self._hooks[stage].copy()
+        return list(self._hooks[stage])
 
     async def execute_stage(
         self,
@@ -121,14 +121,14 @@ class HookRegistry:
         hooks = self._hooks[stage]
 
         if not hooks:
-            logger.debug(f"No hooks registered for stage {stage}")
+            logger.debug("No hooks registered for stage %s", stage)
             return HookResult(success=True, context=context)
 
-        logger.info(f"Executing {len(hooks)} hooks for stage {stage}")
+        logger.info("Executing %d hooks for stage %s", len(hooks), stage)
 
         for hook in hooks:
             try:
-                logger.debug(f"Executing hook: {hook}")
+                logger.debug("Executing hook: %s", hook)
                 result = await hook.execute(context)
 
                 if not result.success:
@@ -151,7 +151,7 @@ class HookRegistry:
                     context = result.context
 
                 if not result.should_continue:
-                    logger.info(f"Hook {hook.name} requested pipeline stop")
+                    logger.info("Hook %s requested pipeline stop", hook.name)
                     return HookResult(
                         success=True,
                         context=context,
@@ -174,7 +174,7 @@ class HookRegistry:
                         should_continue=False,
                     )
 
-        logger.info(f"Completed stage {stage} successfully")
+        logger.info("Completed stage %s successfully", stage)
         return HookResult(success=True, context=context)
 
     def list_hooks(self) -> dict[str, list[str]]:
@@ -185,15 +185,13 @@ class HookRegistry:
         }
 
 
-# Global hook registry instance
-_hook_registry = None
+# Global hook registry instance; created eagerly because construction is
+# trivial and it avoids racing lazy creation from worker threads
+_hook_registry = HookRegistry()
 
 
 def get_hook_registry() -> HookRegistry:
     """Get the global hook registry instance."""
-    global _hook_registry
-    if _hook_registry is None:
-        _hook_registry = HookRegistry()
     return _hook_registry
 
 
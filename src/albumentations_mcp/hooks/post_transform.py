@@ -213,9 +213,9 @@ class PostTransformHook(BaseHook):
     ) -> dict[str, Any]:
         """Calculate basic similarity metrics between original and augmented images."""
         try:
-            # Convert to numpy arrays
-            orig_array = np.array(original)
-            aug_array = np.array(augmented)
+            # Read-only views are enough here and skip a copy of each image
+            orig_array = np.asarray(original)
+            aug_array = np.asarray(augmented)
 
             # Ensure same shape
             if orig_array.shape != aug_array.shape:
@@ -218,6 +218,7 @@ class PreTransformHook(BaseHook):
                     context.image_data = pil_to_base64(
                         resized_image,
                         format=image.format or "PNG",
+                        fast=True,
                     ).encode()
 
                     validation_result.update(
@@ -6,8 +6,11 @@ These are the only conversions actually used by the MCP tools.
 """
 
 import base64
+import hashlib
 import io
 import logging
+import threading
+from collections import OrderedDict
 
 import numpy as np
 from PIL import Image, ImageFile
@@ -21,10 +24,75 @@ logger = logging.getLogger(__name__)
 from .errors import ImageConversionError, ImageValidationError
 from .utils.image_handler import SUPPORTED_FORMATS
 
+# Recently decoded images, keyed by a digest of the full base64 payload; the
+# hook stages decode the same original and augmented images several times
+# per request. Bounded by entry count and by decoded pixel bytes; images
+# above the per-entry cap are never cached, which also bounds the copy made
+# on every hit.
+IMAGE_CACHE_SIZE = 8
+IMAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+IMAGE_CACHE_MAX_ENTRY_BYTES = 16 * 1024 * 1024
+_image_cache: OrderedDict[bytes, Image.Image] = OrderedDict()
+_image_cache_bytes = 0
+_image_cache_lock = threading.Lock()
+
+
+def _image_cache_key(image_b64: str) -> bytes:
+    """Digest the whole payload so distinct images can never share an entry."""
+    return hashlib.blake2b(image_b64.encode(), digest_size=16).digest()
+
+
+def _copy_image(image: Image.Image) -> Image.Image:
+    """Copy an image, keeping the source format that Image.copy() drops."""
+    copied = image.copy()
+    copied.format = image.format
+    return copied
+
+
+def _image_nbytes(image: Image.Image) -> int:
+    """Approximate decoded size: one byte per band per pixel."""
+    width, height = image.size
+    return width * height * len(image.getbands())
+
+
+def _cache_image(cache_key: bytes, image: Image.Image) -> None:
+    """Store a copy of image, evicting least recently used entries to fit."""
+    global _image_cache_bytes
+
+    nbytes = _image_nbytes(image)
+    if nbytes > IMAGE_CACHE_MAX_ENTRY_BYTES:
+        return
+    copied = _copy_image(image)
+    with _image_cache_lock:
+        previous = _image_cache.pop(cache_key, None)
+        if previous is not None:
+            _image_cache_bytes -= _image_nbytes(previous)
+        _image_cache[cache_key] = copied
+        _image_cache_bytes += nbytes
+        while (
+            len(_image_cache) > IMAGE_CACHE_SIZE
+            or _image_cache_bytes > IMAGE_CACHE_MAX_BYTES
+        ):
+            _, evicted = _image_cache.popitem(last=False)
+            _image_cache_bytes -= _image_nbytes(evicted)
+
+
+def clear_image_cache() -> None:
+    """Drop all cached decoded images."""
+    global _image_cache_bytes
+
+    with _image_cache_lock:
+        _image_cache.clear()
+        _image_cache_bytes = 0
+
 
 def base64_to_pil(image_b64: str) -> Image.Image:
     """Convert Base64 string to PIL Image with comprehensive error handling.
 
+    Successful decodes of moderately sized images are cached, so repeated
+    calls with the same payload return a fresh copy of the cached image
+    instead of decoding again.
+
     Args:
         image_b64: Base64 encoded image string (with or without data URL prefix)
 
@@ -35,6 +103,15 @@ def base64_to_pil(image_b64: str) -> Image.Image:
         ImageConversionError: If image data is invalid or conversion fails
         ImageValidationError: If image doesn't meet validation criteria
     """
+    cache_key = _image_cache_key(image_b64) if isinstance(image_b64, str) else None
+    if cache_key is not None:
+        with _image_cache_lock:
+            cached = _image_cache.get(cache_key)
+            if cached is not None:
+                _image_cache.move_to_end(cache_key)
+        if cached is not None:
+            return _copy_image(cached)
+
     try:
         # Use comprehensive validation system
         from .validation import ValidationError, validate_base64_image
@@ -46,14 +123,12 @@ def base64_to_pil(image_b64: str) -> Image.Image:
                 strict=True,
                 skip_security_length_check=True,
             )
-            clean_b64 = validation_result["sanitized_data"]
+            # Reuse the bytes decoded during validation
+            image_data = validation_result["decoded_data"]
         except ValidationError as e:
             # Convert validation errors to image conversion errors for compatibility
             raise ImageConversionError(f"Image validation failed: {e}")
 
-        # Decode the validated Base64 data
-        image_data = base64.b64decode(clean_b64)
-
         # Load image with protection
         from .utils.image_handler import (
             load_image_safely,
@@ -69,6 +144,9 @@ def base64_to_pil(image_b64: str) -> Image.Image:
             f"Successfully converted base64 to PIL image: "
             f"{image.size}, mode: {image.mode}",
         )
+
+        if cache_key is not None:
+            _cache_image(cache_key, image)
         return image
 
     except (ImageConversionError, ImageValidationError):
@@ -79,13 +157,21 @@ def base64_to_pil(image_b64: str) -> Image.Image:
         )
 
 
-def pil_to_base64(image: Image.Image, format: str = "PNG", quality: int = 95) -> str:
+def pil_to_base64(
+    image: Image.Image,
+    format: str = "PNG",
+    quality: int = 95,
+    fast: bool = False,
+) -> str:
     """Convert PIL Image to Base64 string with format validation.
 
     Args:
         image: PIL Image object
         format: Output format (PNG, JPEG, WEBP, etc.)
         quality: JPEG quality (1-100, ignored for PNG)
+        fast: Favour encode speed over output size (PNG compression level 1,
+            no JPEG/PNG optimize pass); meant for payloads that are only
+            decoded again in-process
 
     Returns:
         Base64 encoded image string
@@ -116,7 +202,7 @@ def pil_to_base64(image: Image.Image, format: str = "PNG", quality: int = 95) ->
         save_kwargs = {"format": format}
         if format == "JPEG":
             save_kwargs["quality"] = max(1, min(100, quality))
-            save_kwargs["optimize"] = True
+            save_kwargs["optimize"] = not fast
             # Convert RGBA to RGB for JPEG
             if image.mode == "RGBA":
                 # Create white background
@@ -128,10 +214,15 @@ def pil_to_base64(image: Image.Image, format: str = "PNG", quality: int = 95) ->
             save_kwargs["quality"] = max(1, min(100, quality))
             # If image has alpha, WEBP will preserve it
         elif format == "PNG":
-            save_kwargs["optimize"] = True
+            if fast:
+                save_kwargs["compress_level"] = 1
+            else:
+                save_kwargs["optimize"] = True
 
         image.save(buffer, **save_kwargs)
-        base64_data = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        # Encode from a view of the buffer rather than a copy of its contents
+        with buffer.getbuffer() as encoded:
+            base64_data = base64.b64encode(encoded).decode("utf-8")
 
         logger.debug(
             f"Successfully converted PIL image to base64: "
@@ -173,7 +264,10 @@ def numpy_to_pil(array: np.ndarray) -> Image.Image:
         if array.dtype == np.float32 or array.dtype == np.float64:
             # Assume values are in [0, 1] range
             if array.max() <= 1.0 and array.min() >= 0.0:
-                array = (array * 255).astype(np.uint8)
+                # Scale straight into the uint8 result, no float intermediate
+                scaled = np.empty(array.shape, dtype=np.uint8)
+                np.multiply(array, 255, out=scaled, casting="unsafe")
+                array = scaled
             else:
                 raise ImageValidationError(
                     "Float arrays must have values in [0, 1] range",
@@ -261,8 +355,8 @@ def load_image_from_source(
     return load_image_from_source(image_source, session_dir, temp_paths)
 
 
-def validate_image(image: Image.Image) -> None:
+def validate_image(image: Image.Image, check_array: bool = True) -> None:
     """Full image validation with comprehensive checks - delegates to image handler."""
     from .utils.image_handler import validate_image
 
-    return validate_image(image)
+    return validate_image(image, check_array=check_array)
@@ -71,6 +71,14 @@ class TransformConfig(BaseModel):
                 raise ValueError("blur_limit must be between 3 and 100")
         return v
 
+    def to_dict(self) -> dict[str, Any]:
+        """Return the plain transform spec used by hooks and tool responses."""
+        return {
+            "name": self.name.value,
+            "parameters": self.parameters,
+            "probability": self.probability,
+        }
+
 
 class ParseResult(BaseModel):
     """Result of parsing a natural language prompt."""
@@ -648,14 +656,7 @@ class PromptParser:
                 "valid": len(result.transforms) > 0,
                 "confidence": result.confidence,
                 "transforms_found": len(result.transforms),
-                "transforms": [
-                    {
-                        "name": t.name.value,
-                        "parameters": t.parameters,
-                        "probability": t.probability,
-                    }
-                    for t in result.transforms
-                ],
+                "transforms": [t.to_dict() for t in result.transforms],
                 "warnings": result.warnings,
                 "suggestions": result.suggestions,
                 "message": (
@@ -1,7 +1,12 @@
 """Complete augmentation workflow orchestration with hook system integration."""
 
+import copy
 import logging
+import os
+import re
+import threading
 import uuid
+from collections import OrderedDict
 from datetime import UTC, datetime
 from typing import Any
 
@@ -13,49 +18,85 @@ from .hooks import (
     register_hook,
 )
 from .hooks.post_mcp import PostMCPHook
-from .hooks.post_transform_verify import post_transform_verify_hook
+from .hooks.post_transform_verify import (
+    PostTransformVerifyHook,
+    post_transform_verify_hook,
+)
 from .hooks.pre_mcp import PreMCPHook
 from .parser import PromptParsingError, parse_prompt
 
 logger = logging.getLogger(__name__)
 
+# Max number of prompt -> parser outputs kept by parse_prompt_with_hooks
+PARSE_CACHE_SIZE = 512
+
+# Set NORMALIZE_PROMPT=0 to key the parse cache on the exact prompt text
+NORMALIZE_PROMPT = os.getenv("NORMALIZE_PROMPT", "1").lower() not in (
+    "0",
+    "false",
+    "no",
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_prompt(prompt: str) -> str:
+    """Normalize a prompt for use as a parse cache key.
+
+    Collapses whitespace, lowercases and drops trailing sentence
+    punctuation, none of which change what the parser extracts. Clause
+    order is kept because it determines transform order.
+    """
+    return _WHITESPACE_RE.sub(" ", prompt.strip().lower()).rstrip(".!?, ")
+
 
 class AugmentationPipeline:
     """Complete augmentation pipeline with hook system integration."""
 
     def __init__(self):
         """Initialize pipeline and register default hooks."""
+        self._parse_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        # Tool calls may run on worker threads (see run_async_safely)
+        self._parse_cache_lock = threading.Lock()
         self._setup_default_hooks()
 
     def _setup_default_hooks(self):
-        """Register default hooks for the pipeline."""
+        """Register default hooks for the pipeline.
+
+        Safe to call repeatedly: a default hook is only registered if the
+        registry has no hook of the same type for that stage yet, so
+        re-creating the pipeline does not grow the per-stage hook lists.
+        """
         from .hooks.post_save import PostSaveHook
         from .hooks.post_transform import PostTransformHook
         from .hooks.pre_save import PreSaveHook
         from .hooks.pre_transform import PreTransformHook
 
-        # Register pre-MCP hook
-        register_hook(HookStage.PRE_MCP, PreMCPHook())
-
-        # Register post-MCP hook
-        register_hook(HookStage.POST_MCP, PostMCPHook())
-
-        # Register pre-transform hook
-        register_hook(HookStage.PRE_TRANSFORM, PreTransformHook())
-
-        # Register post-transform hook
-        register_hook(HookStage.POST_TRANSFORM, PostTransformHook())
+        default_hooks = [
+            (HookStage.PRE_MCP, PreMCPHook),
+            (HookStage.POST_MCP, PostMCPHook),
+            (HookStage.PRE_TRANSFORM, PreTransformHook),
+            (HookStage.POST_TRANSFORM, PostTransformHook),
+            (HookStage.POST_TRANSFORM_VERIFY, PostTransformVerifyHook),
+            (HookStage.PRE_SAVE, PreSaveHook),
+            (HookStage.POST_SAVE, PostSaveHook),
+        ]
 
-        # Register post-transform verification hook
-        register_hook(HookStage.POST_TRANSFORM_VERIFY, post_transform_verify_hook)
-
-        # Register pre-save hook
-        register_hook(HookStage.PRE_SAVE, PreSaveHook())
-
-        # Register post-save hook
-        register_hook(HookStage.POST_SAVE, PostSaveHook())
-
-        logger.info("All 7 hooks registered successfully")
+        registry = get_hook_registry()
+        registered = 0
+        for stage, hook_cls in default_hooks:
+            if any(isinstance(h, hook_cls) for h in registry.get_hooks(stage)):
+                continue
+            if hook_cls is PostTransformVerifyHook:
+                register_hook(stage, post_transform_verify_hook)
+            else:
+                register_hook(stage, hook_cls())
+            registered += 1
+
+        if registered:
+            logger.info(f"Registered {registered} default hooks")
+        else:
+            logger.debug("Default hooks already registered")
 
     async def process_image_with_hooks(
         self,
@@ -63,8 +104,13 @@ class AugmentationPipeline:
         prompt: str,
         seed: int | None = None,
         session_id: str | None = None,
+        output_dir: str | None = None,
     ) -> dict[str, Any]:
-        """Process image using the complete 7-stage hook system."""
+        """Process image using the complete 7-stage hook system.
+
+        ``output_dir`` overrides the ``OUTPUT_DIR`` environment variable for
+        this call only.
+        """
         import uuid
 
         from .image_conversions import base64_to_pil, pil_to_base64
@@ -79,7 +125,7 @@ class AugmentationPipeline:
         image = base64_to_pil(image_b64)
 
         # Create session directory with proper structure
-        session_dir = self._create_session_directory(session_id)
+        session_dir = self._create_session_directory(session_id, output_dir)
 
         # Initialize context
         context = HookContext(
@@ -110,12 +156,7 @@ class AugmentationPipeline:
             try:
                 parse_result = parse_prompt(context.original_prompt)
                 context.parsed_transforms = [
-                    {
-                        "name": transform.name.value,
-                        "parameters": transform.parameters,
-                        "probability": transform.probability,
-                    }
-                    for transform in parse_result.transforms
+                    t.to_dict() for t in parse_result.transforms
                 ]
                 context.metadata.update(
                     {
@@ -168,8 +209,11 @@ class AugmentationPipeline:
                 return self._format_error_response(context, error_msg)
 
             # Add processing results to context
+            # The hook context copy is only decoded again in-process, so
+            # favour encode speed; the response gets the compact encoding
             context.augmented_image = pil_to_base64(
                 processing_result.augmented_image,
+                fast=True,
             ).encode()
             context.metadata.update(
                 {
@@ -219,7 +263,10 @@ class AugmentationPipeline:
 
         except Exception as e:
             error_msg = f"Pipeline execution failed: {e!s}"
-            logger.error(error_msg, exc_info=True)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.exception(error_msg)
+            else:
+                logger.error("%s (enable DEBUG for traceback)", error_msg)
             context.errors.append(error_msg)
             return self._format_error_response(context, error_msg)
 
@@ -228,7 +275,12 @@ class AugmentationPipeline:
         prompt: str,
         session_id: str | None = None,
     ) -> dict[str, Any]:
-        """Parse prompt using the complete hook system."""
+        """Parse prompt using the complete hook system.
+
+        The PRE_MCP/POST_MCP hooks run on every call, so the response always
+        describes this call's prompt and session. Only the parser output is
+        cached, per normalized (sanitized) prompt.
+        """
         if session_id is None:
             session_id = str(uuid.uuid4())
 
@@ -253,27 +305,20 @@ class AugmentationPipeline:
 
             # Stage 2: Parse the prompt (core functionality)
             try:
-                parse_result = parse_prompt(context.original_prompt)
+                parsed = self._parse_cached(context.original_prompt)
 
                 # Convert parser result to hook context format
-                context.parsed_transforms = [
-                    {
-                        "name": transform.name.value,
-                        "parameters": transform.parameters,
-                        "probability": transform.probability,
-                    }
-                    for transform in parse_result.transforms
-                ]
+                context.parsed_transforms = parsed["transforms"]
 
                 # Add parser metadata
                 context.metadata.update(
                     {
-                        "parser_confidence": parse_result.confidence,
-                        "parser_warnings": parse_result.warnings,
-                        "parser_suggestions": parse_result.suggestions,
+                        "parser_confidence": parsed["confidence"],
+                        "parser_warnings": parsed["warnings"],
+                        "parser_suggestions": parsed["suggestions"],
                     },
                 )
-                context.warnings.extend(parse_result.warnings)
+                context.warnings.extend(parsed["warnings"])
 
             except PromptParsingError as e:
                 error_msg = f"Prompt parsing failed: {e!s}"
@@ -294,10 +339,48 @@ class AugmentationPipeline:
 
         except Exception as e:
             error_msg = f"Pipeline execution failed: {e!s}"
-            logger.error(error_msg, exc_info=True)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.exception(error_msg)
+            else:
+                logger.error("%s (enable DEBUG for traceback)", error_msg)
             context.errors.append(error_msg)
             return self._format_error_response(context, error_msg)
 
+    def _parse_cached(self, prompt: str) -> dict[str, Any]:
+        """Parse a prompt, reusing the parser output for equivalent prompts.
+
+        Returns a private copy of the transforms, confidence, warnings and
+        suggestions. Parse failures are not cached.
+        """
+        cache_key = _normalize_prompt(prompt) if NORMALIZE_PROMPT else prompt
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(cache_key)
+            if cached is not None:
+                self._parse_cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.debug("Parse cache hit")
+            return copy.deepcopy(cached)
+
+        parse_result = parse_prompt(prompt)
+        parsed = {
+            "transforms": [t.to_dict() for t in parse_result.transforms],
+            "confidence": parse_result.confidence,
+            "warnings": list(parse_result.warnings),
+            "suggestions": list(parse_result.suggestions),
+        }
+        entry = copy.deepcopy(parsed)
+        with self._parse_cache_lock:
+            self._parse_cache[cache_key] = entry
+            self._parse_cache.move_to_end(cache_key)
+            while len(self._parse_cache) > PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        return parsed
+
+    def clear_parse_cache(self) -> None:
+        """Drop all cached parser output."""
+        with self._parse_cache_lock:
+            self._parse_cache.clear()
+
     def _format_success_response(self, context: HookContext) -> dict[str, Any]:
         """Format successful pipeline response."""
         return {
@@ -335,15 +418,17 @@ class AugmentationPipeline:
             "supported_stages": [stage.value for stage in HookStage],
         }
 
-    def _create_session_directory(self, session_id: str) -> str:
+    def _create_session_directory(
+        self,
+        session_id: str,
+        output_dir: str | None = None,
+    ) -> str:
         """Create session directory with proper structure and return path."""
         import os
         from datetime import datetime
         from pathlib import Path
 
-        output_dir = os.getenv("OUTPUT_DIR", "outputs")
-
-        out_path = Path(output_dir)
+        out_path = Path(output_dir or os.getenv("OUTPUT_DIR", "outputs"))
         out_path.mkdir(parents=True, exist_ok=True)
 
         # If a directory for this session already exists (e.g., created by a prior tool), reuse it
@@ -374,15 +459,13 @@ class AugmentationPipeline:
         return str(session_dir)
 
 
-# Global pipeline instance
-_pipeline_instance = None
+# Global pipeline instance, built at import so default hooks are registered
+# before the first request
+_pipeline_instance = AugmentationPipeline()
 
 
 def get_pipeline() -> AugmentationPipeline:
     """Get global pipeline instance."""
-    global _pipeline_instance
-    if _pipeline_instance is None:
-        _pipeline_instance = AugmentationPipeline()
     return _pipeline_instance
 
 
@@ -399,6 +482,7 @@ async def process_image_with_hooks(
     prompt: str,
     seed: int | None = None,
     session_id: str | None = None,
+    output_dir: str | None = None,
 ) -> dict[str, Any]:
     """Convenience function to process image with full hook pipeline."""
     return await get_pipeline().process_image_with_hooks(
@@ -406,4 +490,5 @@ async def process_image_with_hooks(
         prompt,
         seed,
         session_id,
+        output_dir,
     )
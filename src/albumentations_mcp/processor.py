@@ -5,11 +5,16 @@ Albumentations transforms to images based on parsed natural language prompts.
 Uses Albumentations' native seeding for reproducibility.
 """
 
+import functools
+import inspect
 import logging
+import threading
 import time
-from typing import Any
+from collections import OrderedDict
+from typing import Any, Literal
 
 import albumentations as A
+import numpy as np
 from PIL import Image
 from pydantic import BaseModel, Field
 
@@ -18,9 +23,133 @@ from .image_conversions import (
     pil_to_numpy,
     validate_image,
 )
+from .utils.image_handler import validate_array_dimensions
+from .utils.seed_utils import get_effective_seed, get_seed_metadata
 
 logger = logging.getLogger(__name__)
 
+# Transform name -> class, built once instead of probing the module per call
+_TRANSFORM_REGISTRY: dict[str, type[A.BasicTransform]] = {
+    name: obj
+    for name, obj in vars(A).items()
+    if isinstance(obj, type) and issubclass(obj, A.BasicTransform)
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _accepted_parameters(transform_name: str) -> frozenset[str] | None:
+    """Return the keyword arguments a transform accepts, or None if any."""
+    try:
+        signature = inspect.signature(_TRANSFORM_REGISTRY[transform_name])
+    except (KeyError, TypeError, ValueError):
+        return None
+    params = signature.parameters.values()
+    if any(param.kind is inspect.Parameter.VAR_KEYWORD for param in params):
+        return None
+    return frozenset(param.name for param in params)
+
+
+def _spec_key(value: Any) -> Any:
+    """Convert a transform spec into a hashable, order-preserving cache key.
+
+    Dicts become sorted ``(key, value)`` tuples tagged with ``dict`` (so a
+    dict never collides with an equivalent list of pairs) and lists become
+    tuples, so specs with list parameters (e.g. ``var_limit: [10, 50]``) are
+    hashable.
+    """
+    if isinstance(value, dict):
+        return (dict, tuple(sorted((k, _spec_key(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return tuple(_spec_key(v) for v in value)
+    return value
+
+
+def _validate_blur_params(params: dict[str, Any]) -> dict[str, Any]:
+    """Ensure blur_limit is odd and within valid range."""
+    blur_limit = params.get("blur_limit")
+    if isinstance(blur_limit, (int, float)):
+        blur_limit = int(blur_limit)
+        if blur_limit % 2 == 0:
+            blur_limit += 1
+        params["blur_limit"] = max(3, min(blur_limit, 99))
+    return params
+
+
+def _validate_rotate_params(params: dict[str, Any]) -> dict[str, Any]:
+    """Ensure rotation limit is within valid range."""
+    limit = params.get("limit")
+    if isinstance(limit, (int, float)):
+        params["limit"] = max(-180, min(float(limit), 180))
+    return params
+
+
+def _validate_brightness_contrast_params(params: dict[str, Any]) -> dict[str, Any]:
+    """Clamp brightness and contrast limits to [0, 1]."""
+    for key in ("brightness_limit", "contrast_limit"):
+        value = params.get(key)
+        if isinstance(value, (int, float)):
+            params[key] = max(0.0, min(float(value), 1.0))
+    return params
+
+
+def _validate_gauss_noise_params(params: dict[str, Any]) -> dict[str, Any]:
+    """Ensure noise variance is within valid range."""
+    var_limit = params.get("var_limit")
+    if isinstance(var_limit, (tuple, list)) and len(var_limit) == 2:
+        min_var, max_var = var_limit
+        params["var_limit"] = (
+            max(0.0, float(min_var)),
+            min(255.0, float(max_var)),
+        )
+    return params
+
+
+def _validate_crop_params(params: dict[str, Any]) -> dict[str, Any]:
+    """Ensure crop dimensions are positive integers."""
+    for dim in ("height", "width"):
+        value = params.get(dim)
+        if isinstance(value, (int, float)):
+            params[dim] = max(1, int(value))
+    return params
+
+
+# Transform name -> parameter validator used by _validate_parameters
+_PARAMETER_VALIDATORS = {
+    "Blur": _validate_blur_params,
+    "GaussianBlur": _validate_blur_params,
+    "MotionBlur": _validate_blur_params,
+    "Rotate": _validate_rotate_params,
+    "RandomBrightnessContrast": _validate_brightness_contrast_params,
+    "GaussNoise": _validate_gauss_noise_params,
+    "RandomCrop": _validate_crop_params,
+    "RandomResizedCrop": _validate_crop_params,
+}
+
+
+def _as_output(
+    image: Image.Image | np.ndarray,
+    output_format: str,
+) -> Image.Image | np.ndarray:
+    """Return an unprocessed input image in the requested output format."""
+    if output_format == "ndarray":
+        return image if isinstance(image, np.ndarray) else pil_to_numpy(image)
+    return numpy_to_pil(image) if isinstance(image, np.ndarray) else image
+
+
+def _restore_ndim(
+    augmented: np.ndarray,
+    image: Image.Image | np.ndarray,
+) -> np.ndarray:
+    """Drop the channel axis added for a 2D (H, W) input array."""
+    if (
+        isinstance(image, np.ndarray)
+        and image.ndim == 2
+        and augmented.ndim == 3
+        and augmented.shape[2] == 1
+    ):
+        return augmented[:, :, 0]
+    return augmented
+
 
 class ProcessingError(Exception):
     """Raised when image processing fails."""
@@ -32,7 +161,10 @@ class ProcessingResult(BaseModel):
     model_config = {"arbitrary_types_allowed": True}
 
     success: bool = Field(..., description="Whether processing completed successfully")
-    augmented_image: Image.Image | None = Field(None, description="Processed image")
+    augmented_image: Image.Image | np.ndarray | None = Field(
+        None,
+        description="Processed image (PIL, or array when output_format='ndarray')",
+    )
     applied_transforms: list[dict[str, Any]] = Field(
         default_factory=list,
         description="Successfully applied transforms",
@@ -54,41 +186,59 @@ class ImageProcessor:
 
     def __init__(self):
         """Initialize the image processor."""
-        self._transform_cache = {}  # Cache for compiled transforms
-        self._pipeline_cache = {}  # Cache for compiled pipelines
+        # Cached transforms and pipelines are reseeded in place before each
+        # call, so every thread (tools run on worker threads) keeps its own
+        # caches rather than sharing objects another request may reseed
+        self._local = threading.local()
+        self._cache_generation = 0  # Bumped by clear_caches for all threads
+        self._cache_generation_lock = threading.Lock()
         self._max_cache_size = 100  # Limit cache size to prevent memory leaks
 
+    def _thread_caches(self) -> threading.local:
+        """Return this thread's caches, resetting them after clear_caches."""
+        local = self._local
+        if getattr(local, "generation", None) != self._cache_generation:
+            local.transform_cache = {}  # Cache for compiled transforms
+            local.pipeline_cache = OrderedDict()  # LRU of compiled pipelines
+            local.generation = self._cache_generation
+        return local
+
+    @property
+    def _transform_cache(self) -> dict[tuple, A.BasicTransform]:
+        return self._thread_caches().transform_cache
+
+    @property
+    def _pipeline_cache(self) -> OrderedDict:
+        return self._thread_caches().pipeline_cache
+
     def process_image(
         self,
-        image: Image.Image,
+        image: Image.Image | np.ndarray,
         transforms: list[dict[str, Any]],
         seed: int | None = None,
+        output_format: Literal["pil", "ndarray"] = "pil",
     ) -> ProcessingResult:
         """Process image with given transform specifications.
 
         Args:
-            image: PIL Image to process
+            image: PIL Image or (H, W[, C]) uint8 array to process. Arrays are
+                passed to Albumentations as-is, skipping the PIL round-trip.
             transforms: List of transform specifications from parser
             seed: Optional seed for reproducible results
+            output_format: Return ``augmented_image`` as a PIL Image ("pil")
+                or as a numpy array ("ndarray")
 
         Returns:
             ProcessingResult with augmented image and metadata
         """
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         applied_transforms = []
         skipped_transforms = []
 
         try:
-            # Validate input image
-            validate_image(image)
-            original_size = image.size
-
-            # Convert PIL to numpy for Albumentations
-            image_array = pil_to_numpy(image)
+            original_size = self._validate_input(image)
 
             # Get effective seed using simple seed manager
-            from .utils.seed_utils import get_effective_seed, get_seed_metadata
-
             effective_seed = get_effective_seed(seed)
             seed_metadata = get_seed_metadata(effective_seed, seed)
 
@@ -102,10 +252,10 @@ class ImageProcessor:
 
             if not pipeline:
                 # No valid transforms, return original
-                execution_time = time.time() - start_time
+                execution_time = (time.perf_counter_ns() - start_time) / 1e9
                 return ProcessingResult(
                     success=True,
-                    augmented_image=image,
+                    augmented_image=_as_output(image, output_format),
                     applied_transforms=applied_transforms,
                     skipped_transforms=skipped_transforms,
                     metadata={
@@ -119,6 +269,9 @@ class ImageProcessor:
                     execution_time=execution_time,
                 )
 
+            # Only convert once there is something to apply
+            image_array = self._to_array(image)
+
             # Apply transforms with memory recovery protection
             from .recovery import get_memory_recovery_manager
 
@@ -129,10 +282,10 @@ class ImageProcessor:
                     # Check memory limits before processing
                     if not memory_manager.check_memory_limits("transform_pipeline"):
                         logger.warning("Memory limits exceeded, using original image")
-                        execution_time = time.time() - start_time
+                        execution_time = (time.perf_counter_ns() - start_time) / 1e9
                         return ProcessingResult(
                             success=True,
-                            augmented_image=image,
+                            augmented_image=_as_output(image, output_format),
                             applied_transforms=[],
                             skipped_transforms=transforms,
                             metadata={
@@ -149,8 +302,12 @@ class ImageProcessor:
                         )
 
                     augmented = pipeline(image=image_array)["image"]
-                    augmented_image = numpy_to_pil(augmented)
-                    execution_time = time.time() - start_time
+                    augmented_image = (
+                        _restore_ndim(augmented, image)
+                        if output_format == "ndarray"
+                        else numpy_to_pil(augmented)
+                    )
+                    execution_time = (time.perf_counter_ns() - start_time) / 1e9
 
                     return ProcessingResult(
                         success=True,
@@ -159,11 +316,11 @@ class ImageProcessor:
                         skipped_transforms=skipped_transforms,
                         metadata={
                             "original_size": original_size,
-                            "output_size": augmented_image.size,
+                            "output_size": (augmented.shape[1], augmented.shape[0]),
                             "processing_time": execution_time,
                             "transforms_applied": len(applied_transforms),
                             "transforms_skipped": len(skipped_transforms),
-                            "pipeline_hash": hash(str(transforms)),
+                            "pipeline_hash": pipeline_metadata["pipeline_hash"],
                             **seed_metadata,
                         },
                         execution_time=execution_time,
@@ -171,12 +328,12 @@ class ImageProcessor:
 
             except Exception as e:
                 logger.error(f"Transform pipeline execution failed: {e}")
-                execution_time = time.time() - start_time
+                execution_time = (time.perf_counter_ns() - start_time) / 1e9
 
                 # Attempt graceful degradation - return original image
                 return ProcessingResult(
                     success=True,  # Still successful since we return original
-                    augmented_image=image,
+                    augmented_image=_as_output(image, output_format),
                     applied_transforms=[],
                     skipped_transforms=transforms,
                     metadata={
@@ -194,7 +351,7 @@ class ImageProcessor:
                 )
 
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = (time.perf_counter_ns() - start_time) / 1e9
             logger.error(f"Image processing failed: {e}")
 
             # Simple fallback metadata
@@ -213,6 +370,129 @@ class ImageProcessor:
                 error_message=f"Processing failed: {e}",
             )
 
+    def process_batch(
+        self,
+        images: list[Image.Image | np.ndarray],
+        transforms: list[dict[str, Any]],
+        seed: int | None = None,
+        output_format: Literal["pil", "ndarray"] = "pil",
+    ) -> list[ProcessingResult]:
+        """Process several same-sized images with a single pipeline call.
+
+        The images are stacked and passed to Albumentations as
+        ``pipeline(images=...)``, so every image receives the same sampled
+        transform parameters (as with video frames). Mixed sizes or a failed
+        batch call fall back to per-image ``process_image`` calls.
+
+        Args:
+            images: PIL Images or arrays to process
+            transforms: List of transform specifications from parser
+            seed: Optional seed for reproducible results
+            output_format: Return images as PIL Images or numpy arrays
+
+        Returns:
+            One ProcessingResult per input image, in order
+        """
+        if not images:
+            return []
+
+        start_time = time.perf_counter_ns()
+
+        def process_individually() -> list[ProcessingResult]:
+            return [
+                self.process_image(image, transforms, seed, output_format)
+                for image in images
+            ]
+
+        try:
+            prepared = [self._prepare_input(image) for image in images]
+            if len({array.shape for array, _ in prepared}) != 1:
+                return process_individually()
+
+            effective_seed = get_effective_seed(seed)
+            seed_metadata = get_seed_metadata(effective_seed, seed)
+
+            pipeline, pipeline_metadata = self._create_pipeline(
+                transforms,
+                effective_seed,
+            )
+            if not pipeline:
+                return process_individually()
+
+            from .recovery import get_memory_recovery_manager
+
+            memory_manager = get_memory_recovery_manager()
+            with memory_manager.memory_recovery_context("transform_batch"):
+                if not memory_manager.check_memory_limits("transform_batch"):
+                    return process_individually()
+
+                batch = np.stack([array for array, _ in prepared])
+                augmented = pipeline(images=batch)["images"]
+
+        except Exception as e:
+            logger.warning(f"Batch processing failed, processing individually: {e}")
+            return process_individually()
+
+        execution_time = (time.perf_counter_ns() - start_time) / 1e9
+        applied_transforms = pipeline_metadata["applied"]
+        skipped_transforms = pipeline_metadata["skipped"]
+
+        results = []
+        for image, (_, original_size), frame in zip(
+            images, prepared, augmented, strict=True
+        ):
+            results.append(
+                ProcessingResult(
+                    success=True,
+                    augmented_image=(
+                        _restore_ndim(frame, image)
+                        if output_format == "ndarray"
+                        else numpy_to_pil(frame)
+                    ),
+                    applied_transforms=applied_transforms,
+                    skipped_transforms=skipped_transforms,
+                    metadata={
+                        "original_size": original_size,
+                        "output_size": (frame.shape[1], frame.shape[0]),
+                        "processing_time": execution_time,
+                        "transforms_applied": len(applied_transforms),
+                        "transforms_skipped": len(skipped_transforms),
+                        "pipeline_hash": pipeline_metadata["pipeline_hash"],
+                        "batch_size": len(images),
+                        **seed_metadata,
+                    },
+                    execution_time=execution_time,
+                ),
+            )
+        return results
+
+    def _prepare_input(
+        self,
+        image: Image.Image | np.ndarray,
+    ) -> tuple[np.ndarray, tuple[int, int]]:
+        """Validate an input image and return (array, (width, height))."""
+        original_size = self._validate_input(image)
+        return self._to_array(image), original_size
+
+    def _validate_input(self, image: Image.Image | np.ndarray) -> tuple[int, int]:
+        """Validate an input image and return its (width, height)."""
+        if isinstance(image, np.ndarray):
+            validate_array_dimensions(image)
+            return image.shape[1], image.shape[0]
+
+        # pil_to_numpy is the array conversion check, so skip it here
+        validate_image(image, check_array=False)
+        return image.size
+
+    def _to_array(self, image: Image.Image | np.ndarray) -> np.ndarray:
+        """Return the (H, W, C) array Albumentations expects."""
+        if isinstance(image, np.ndarray):
+            # Caller already holds an array, no conversion needed
+            return image if image.ndim == 3 else image[:, :, np.newaxis]
+
+        # Convert PIL to numpy for Albumentations
+        return pil_to_numpy(image)
+
     def _create_pipeline(
         self,
         transforms: list[dict[str, Any]],
@@ -227,15 +507,19 @@ class ImageProcessor:
         Returns:
             Tuple of (pipeline, metadata) where pipeline may be None if no valid transforms
         """
-        # Create cache key for pipeline caching (excluding seed for broader reuse)
-        cache_key = hash(str(sorted(transforms, key=lambda x: x.get("name", ""))))
-
-        # Check pipeline cache first
-        if cache_key in self._pipeline_cache:
-            cached_pipeline, cached_metadata = self._pipeline_cache[cache_key]
-            # Apply seed to cached pipeline if needed
-            if seed is not None and hasattr(cached_pipeline, "seed"):
-                cached_pipeline.seed = seed
+        # Cache key keeps transform order (it changes the output) but not the
+        # seed: cached pipelines are reseeded on every use
+        pipeline_cache = self._pipeline_cache
+        try:
+            cache_key = _spec_key(transforms)
+            cached = pipeline_cache.get(cache_key)
+        except TypeError:  # unhashable parameter values, skip caching
+            cache_key, cached = None, None
+
+        if cached is not None:
+            pipeline_cache.move_to_end(cache_key)
+            cached_pipeline, cached_metadata = cached
+            cached_pipeline.set_random_seed(seed)
             return cached_pipeline, cached_metadata.copy()
 
         valid_transforms = []
@@ -264,20 +548,19 @@ class ImageProcessor:
             }
 
         try:
-            # Create pipeline without seed for caching
-            pipeline = A.Compose(valid_transforms)
+            pipeline = A.Compose(valid_transforms, seed=seed)
             metadata = {
                 "applied": applied_transforms,
                 "skipped": skipped_transforms,
+                "pipeline_hash": hash(
+                    cache_key if cache_key is not None else str(transforms),
+                ),
             }
 
-            # Cache the pipeline if cache isn't full
-            if len(self._pipeline_cache) < self._max_cache_size:
-                self._pipeline_cache[cache_key] = (pipeline, metadata)
-
-            # Apply seed if provided
-            if seed is not None:
-                pipeline = A.Compose(valid_transforms, seed=seed)
+            if cache_key is not None:
+                pipeline_cache[cache_key] = (pipeline, metadata)
+                if len(pipeline_cache) > self._max_cache_size:
+                    pipeline_cache.popitem(last=False)
 
             return pipeline, metadata
         except Exception as e:
@@ -293,18 +576,22 @@ class ImageProcessor:
         parameters = transform_spec.get("parameters", {})
 
         # Create cache key
-        cache_key = (transform_name, tuple(sorted(parameters.items())))
+        cache_key = (transform_name, _spec_key(parameters))
 
         # Check cache first
-        if cache_key in self._transform_cache:
-            return self._transform_cache[cache_key]
+        transform_cache = self._transform_cache
+        try:
+            if cache_key in transform_cache:
+                return transform_cache[cache_key]
+        except TypeError:  # unhashable parameter values, skip caching
+            return self._create_transform(transform_spec)
 
         # Create transform
         transform_obj = self._create_transform(transform_spec)
 
         # Cache if successful and cache isn't full
-        if transform_obj and len(self._transform_cache) < self._max_cache_size:
-            self._transform_cache[cache_key] = transform_obj
+        if transform_obj and len(transform_cache) < self._max_cache_size:
+            transform_cache[cache_key] = transform_obj
 
         return transform_obj
 
@@ -329,15 +616,23 @@ class ImageProcessor:
 
         try:
             # Get transform class from Albumentations
-            if not hasattr(A, transform_name):
+            transform_class = _TRANSFORM_REGISTRY.get(transform_name)
+            if transform_class is None:
                 logger.warning(f"Unknown transform: {transform_name}")
                 return None
 
-            transform_class = getattr(A, transform_name)
-
             # Validate and clean parameters
             clean_params = self._validate_parameters(transform_name, parameters)
 
+            # Drop arguments the transform would reject or ignore
+            accepted = _accepted_parameters(transform_name)
+            if accepted is not None and not accepted.issuperset(clean_params):
+                ignored = sorted(set(clean_params) - accepted)
+                logger.warning(
+                    f"Ignoring parameters not accepted by {transform_name}: {ignored}",
+                )
+                clean_params = {k: v for k, v in clean_params.items() if k in accepted}
+
             # Create transform instance
             transform = transform_class(**clean_params)
 
@@ -394,60 +689,9 @@ class ImageProcessor:
         clean_params = {k: v for k, v in parameters.items() if v is not None}
 
         # Transform-specific parameter validation
-        if transform_name in ["Blur", "GaussianBlur", "MotionBlur"]:
-            if "blur_limit" in clean_params:
-                # Ensure blur_limit is odd and within valid range
-                blur_limit = clean_params["blur_limit"]
-                if isinstance(blur_limit, (int, float)):
-                    blur_limit = int(blur_limit)
-                    if blur_limit % 2 == 0:
-                        blur_limit += 1
-                    clean_params["blur_limit"] = max(3, min(blur_limit, 99))
-
-        elif transform_name == "Rotate":
-            if "limit" in clean_params:
-                # Ensure rotation limit is within valid range
-                limit = clean_params["limit"]
-                if isinstance(limit, (int, float)):
-                    clean_params["limit"] = max(-180, min(float(limit), 180))
-
-        elif transform_name == "RandomBrightnessContrast":
-            # Handle brightness limit
-            if "brightness_limit" in clean_params:
-                brightness_limit = clean_params["brightness_limit"]
-                if isinstance(brightness_limit, (int, float)):
-                    clean_params["brightness_limit"] = max(
-                        0.0,
-                        min(float(brightness_limit), 1.0),
-                    )
-
-            # Handle contrast limit
-            if "contrast_limit" in clean_params:
-                contrast_limit = clean_params["contrast_limit"]
-                if isinstance(contrast_limit, (int, float)):
-                    clean_params["contrast_limit"] = max(
-                        0.0,
-                        min(float(contrast_limit), 1.0),
-                    )
-
-        elif transform_name == "GaussNoise":
-            if "var_limit" in clean_params:
-                var_limit = clean_params["var_limit"]
-                if isinstance(var_limit, (tuple, list)) and len(var_limit) == 2:
-                    # Ensure noise variance is within valid range
-                    min_var, max_var = var_limit
-                    clean_params["var_limit"] = (
-                        max(0.0, float(min_var)),
-                        min(255.0, float(max_var)),
-                    )
-
-        elif transform_name in ["RandomCrop", "RandomResizedCrop"]:
-            # Ensure crop dimensions are positive integers
-            for dim in ["height", "width"]:
-                if dim in clean_params:
-                    value = clean_params[dim]
-                    if isinstance(value, (int, float)):
-                        clean_params[dim] = max(1, int(value))
+        validator = _PARAMETER_VALIDATORS.get(transform_name)
+        if validator:
+            clean_params = validator(clean_params)
 
         # Ensure probability is valid
         if "p" in clean_params:
@@ -458,13 +702,16 @@ class ImageProcessor:
         return clean_params
 
     def clear_caches(self) -> None:
-        """Clear transform and pipeline caches to free memory."""
-        self._transform_cache.clear()
-        self._pipeline_cache.clear()
+        """Clear transform and pipeline caches to free memory.
+
+        Each thread drops its caches the next time it uses them.
+        """
+        with self._cache_generation_lock:
+            self._cache_generation += 1
         logger.debug("Cleared processor caches")
 
     def get_cache_stats(self) -> dict[str, int]:
-        """Get cache statistics for monitoring."""
+        """Get cache statistics for monitoring (for the calling thread)."""
         return {
             "transform_cache_size": len(self._transform_cache),
             "pipeline_cache_size": len(self._pipeline_cache),
@@ -485,9 +732,15 @@ def get_processor() -> ImageProcessor:
 
 
 def process_image(
-    image: Image.Image,
+    image: Image.Image | np.ndarray,
     transforms: list[dict[str, Any]],
     seed: int | None = None,
+    output_format: Literal["pil", "ndarray"] = "pil",
 ) -> ProcessingResult:
     """Convenience function to process image with transforms."""
-    return get_processor().process_image(image, transforms, seed=seed)
+    return get_processor().process_image(
+        image,
+        transforms,
+        seed=seed,
+        output_format=output_format,
+    )
@@ -6,28 +6,96 @@ An MCP-compliant image augmentation server that bridges natural language
 processing with computer vision using the Albumentations library.
 """
 
+import asyncio
+import base64
+import copy
+import functools
+import io
 import json
 import logging
 import os
 import sys
+import time
 from datetime import datetime
+from math import sqrt
 from pathlib import Path
+from secrets import token_hex
 
 from mcp.server.fastmcp import FastMCP
 from PIL import Image
 
-from .config import get_prompt_max_length, get_vlm_prompt_max_length
+from .config import (
+    get_max_bytes_in,
+    get_max_image_size,
+    get_max_pixels_in,
+    get_prompt_max_length,
+    get_vlm_prompt_max_length,
+    is_strict_mode,
+)
+from .image_conversions import load_image_from_source, pil_to_base64
 from .parser import get_available_transforms
-from .pipeline import get_pipeline, parse_prompt_with_hooks
-from .presets import get_available_presets, get_preset
+from .pipeline import get_pipeline, parse_prompt_with_hooks, process_image_with_hooks
+from .presets import get_available_presets, list_preset_names
+from .utils import run_async_safely
+from .utils.image_handler import b64decode
+from .utils.seed_utils import get_global_seed, set_global_seed
+from .utils.validation_utils import (
+    sanitize_base64_input,
+    validate_numeric_range,
+    validate_string_input,
+)
 
 # VLM config loader (file-first)
 from .vlm.config import get_vlm_api_key, load_vlm_config
 
+logger = logging.getLogger(__name__)
+
 # Initialize FastMCP server
 mcp = FastMCP("albumentations-mcp")
 
 
+def _threaded_tool(func):
+    """Register a blocking tool that runs on a worker thread.
+
+    FastMCP calls synchronous tools directly on its event loop, so a long
+    augmentation would stall every other request. The registered tool is an
+    async wrapper around ``asyncio.to_thread``; the function itself is
+    returned unchanged so direct Python callers stay synchronous.
+    """
+
+    @functools.wraps(func)
+    async def run_in_thread(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    mcp.tool()(run_in_thread)
+    return func
+
+
+# Preset names accepted by augment_image, derived from the preset registry
+_VALID_PRESETS = frozenset(list_preset_names())
+
+# Effective prompt for each preset that has transforms, built once at import
+_PRESET_PROMPTS = {
+    name: f"apply {name} preset"
+    for name, config in get_available_presets().items()
+    if config.get("transforms")
+}
+
+# Session originals are JPEG for opaque photos, PNG otherwise
+_SESSION_ORIGINAL_SUFFIXES = (".jpg", ".png")
+
+# Encoded formats forwarded from disk without a decode/re-encode round-trip
+_PASSTHROUGH_FORMATS = frozenset({"JPEG", "PNG", "WEBP"})
+
+# Prefix inspected by _detect_image_source_type, and the non-alphanumeric
+# base64 characters it strips before the alphabet check
+_SOURCE_SNIFF_LENGTH = 128
+_B64_PUNCTUATION = str.maketrans("", "", "=+/")
+
+# Longest string worth an os.path.exists() probe (Linux PATH_MAX)
+_PATH_MAX = 4096
+
+
 # Simple health check
 @mcp.tool()
 def ping() -> dict:
@@ -57,8 +125,6 @@ def validate_mcp_request(tool_name: str, **kwargs) -> tuple[bool, str | None]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    from .utils.validation_utils import validate_numeric_range, validate_string_input
-
     try:
         # Tool-specific validation using existing utilities
         if tool_name == "augment_image":
@@ -84,14 +150,10 @@ def validate_mcp_request(tool_name: str, **kwargs) -> tuple[bool, str | None]:
                 )
             if kwargs.get("preset"):
                 validate_string_input(kwargs["preset"], "preset", max_length=50)
-                if kwargs["preset"] not in [
-                    "segmentation",
-                    "portrait",
-                    "lowlight",
-                ]:
+                if kwargs["preset"] not in _VALID_PRESETS:
                     return (
                         False,
-                        "preset must be one of: segmentation, portrait, lowlight",
+                        f"preset must be one of: {', '.join(list_preset_names())}",
                     )
             if "seed" in kwargs and kwargs["seed"] is not None:
                 validate_numeric_range(
@@ -155,23 +217,17 @@ def _validate_augmentation_inputs(
         )
 
     if prompt_provided and preset_provided:
-        import logging
-
-        logger = logging.getLogger(__name__)
         logger.warning("Both prompt and preset provided, using preset")
 
     return True, None
 
 
-def _load_session_image(session_id: str) -> tuple[str | None, str | None]:
+def _load_session_image(
+    session_id: str,
+    output_dir: str | None = None,
+) -> tuple[str | None, str | None]:
     """Load image from session directory. Returns (image_b64, error_message)."""
-
-    from PIL import Image
-
-    from .image_conversions import pil_to_base64
-
-    output_dir = os.getenv("OUTPUT_DIR", "outputs")
-    out_path = Path(output_dir)
+    out_path = Path(output_dir or os.getenv("OUTPUT_DIR", "outputs"))
     # Locate existing session directory matching *_{session_id}
     candidates = sorted(
         [
@@ -190,16 +246,23 @@ def _load_session_image(session_id: str) -> tuple[str | None, str | None]:
             f"Session '{session_id}' not found. Use load_image_for_processing first to load an image.",
         )
 
-    original_image_path = session_dir / f"original_{session_id}.png"
-    if not original_image_path.exists():
+    original_image_path = next(
+        (
+            path
+            for suffix in _SESSION_ORIGINAL_SUFFIXES
+            if (path := session_dir / f"original_{session_id}{suffix}").exists()
+        ),
+        None,
+    )
+    if original_image_path is None:
         return (
             None,
             f"Original image not found for session '{session_id}'. Use load_image_for_processing first.",
         )
 
     try:
-        image = Image.open(original_image_path)
-        image_b64 = pil_to_base64(image)
+        # Session originals are already JPEG/PNG; forward the encoded bytes
+        image_b64 = base64.b64encode(original_image_path.read_bytes()).decode("ascii")
         return image_b64, None
     except Exception as e:
         return None, f"Failed to load session image: {e}"
@@ -211,23 +274,21 @@ def _prepare_processing_prompt(
 ) -> tuple[str | None, str | None]:
     """Prepare the effective prompt for processing. Returns (effective_prompt, error_message)."""
     if preset and preset.strip():
-        preset_config = get_preset(preset)
-        if not preset_config:
+        name = preset.lower()
+        if name not in _VALID_PRESETS:
             return (
                 None,
                 f"Preset '{preset}' not found. Use list_available_presets tool to see available presets.",
             )
 
-        from .presets import preset_to_transforms
-
-        transforms = preset_to_transforms(preset)
-        if not transforms:
+        effective_prompt = _PRESET_PROMPTS.get(name)
+        if effective_prompt is None:
             return (
                 None,
                 f"Preset '{preset}' contains no valid transforms. Use list_available_presets tool to see available presets.",
             )
 
-        return f"apply {preset} preset", None
+        return effective_prompt, None
     return prompt.strip(), None
 
 
@@ -236,19 +297,17 @@ def _execute_pipeline(
     effective_prompt: str,
     seed: int | None,
     session_id: str,
+    output_dir: str | None = None,
 ) -> dict:
     """Execute the processing pipeline. Returns pipeline result."""
-    from .pipeline import process_image_with_hooks
-
     # Using master async function to eliminate duplicate code
-    from .utils import run_async_safely
-
     return run_async_safely(
         process_image_with_hooks,
         image_b64,
         effective_prompt,
         seed,
         session_id,
+        output_dir,
     )
 
 
@@ -258,40 +317,29 @@ def _format_success_response(
     input_mode: str = "session",
 ) -> str:
     """Format successful pipeline response."""
-    file_paths = pipeline_result["metadata"].get("file_paths", {})
-    returned_session_id = pipeline_result.get("session_id", session_id)
+    metadata = pipeline_result["metadata"]
+    file_paths = metadata.get("file_paths") or {}
 
-    if file_paths and "augmented_image" in file_paths:
-        from pathlib import Path
-
-        augmented_path = file_paths.get("augmented_image")
+    if augmented_path := file_paths.get("augmented_image"):
         original_path = file_paths.get("original_image")
         metadata_path = file_paths.get("metadata") or file_paths.get(
             "transform_spec",
         )
 
-        # Derive full session folder from any known artifact path
-        session_dir = None
-        for p in (augmented_path, original_path, metadata_path):
-            if p:
-                try:
-                    session_dir = str(Path(p).parent.parent)
-                    break
-                except Exception:
-                    continue
+        # Artifacts live in <session_dir>/images/, so the session folder is
+        # two levels up from the augmented image
+        session_dir = Path(augmented_path).parent.parent
 
         lines: list[str] = []
         lines.append("✅ Image successfully augmented and saved!")
         lines.append("")
         lines.append("📁 Files saved:")
-        if augmented_path:
-            lines.append(f"- Augmented image: {augmented_path}")
+        lines.append(f"- Augmented image: {augmented_path}")
         if original_path:
             lines.append(f"- Original image: {original_path}")
         if metadata_path:
             lines.append(f"- Metadata: {metadata_path}")
-        if session_dir:
-            lines.append(f"- Full session folder: {session_dir}")
+        lines.append(f"- Full session folder: {session_dir}")
         lines.append("")
         lines.append(
             "💡 All files are accessible via filesystem tools for further analysis.",
@@ -300,16 +348,16 @@ def _format_success_response(
         return "\n".join(lines)
 
     # Fallback if file saving failed
-    applied_transforms = (
-        pipeline_result["metadata"]
-        .get("processing_result", {})
-        .get("applied_transforms", [])
+    returned_session_id = pipeline_result.get("session_id", session_id)
+    applied_transforms = metadata.get("processing_result", {}).get(
+        "applied_transforms",
+        [],
     )
     transform_names = [t.get("name", "Unknown") for t in applied_transforms]
     return f"✅ Image successfully augmented!\n\n🔧 Transforms applied: {', '.join(transform_names) if transform_names else 'None'}\n• Session ID: {returned_session_id}\n\nNote: File saving may have failed, but transformation was successful."
 
 
-@mcp.tool()
+@_threaded_tool
 def augment_image(
     image_path: str = "",
     image_b64: str = "",
@@ -377,6 +425,7 @@ def augment_image(
             image_path,
             image_b64,
             session_id,
+            output_dir,
         )
         if error:
             return f"❌ Error: {error}"
@@ -388,28 +437,22 @@ def augment_image(
 
         # 5. Generate session ID if not provided
         if not session_id or not session_id.strip():
-            import uuid
-
-            session_id = str(uuid.uuid4())[:8]
+            session_id = token_hex(4)
 
-        # 6. Set up output directory
-        if output_dir:
-            import os
-
-            os.environ["OUTPUT_DIR"] = output_dir
-
-        # 7. Check pipeline status (hooks employed)
+        # 6. Check pipeline status (hooks employed)
         pipeline = get_pipeline()
         status = pipeline.get_pipeline_status()
         if not status.get("registered_hooks"):
             return "❌ Error: Pipeline not ready - no hooks registered."
 
-        # 8. Execute pipeline
+        # 7. Execute pipeline; output_dir is passed per call rather than via
+        # OUTPUT_DIR so concurrent requests cannot redirect each other's files
         pipeline_result = _execute_pipeline(
             loaded_image_b64,
             effective_prompt,
             seed,
             session_id,
+            output_dir,
         )
 
         if pipeline_result["success"]:
@@ -418,9 +461,6 @@ def augment_image(
         return f"❌ Error: {error_msg}. Use validate_prompt tool to test your prompt or list_available_transforms tool to see available transforms."
 
     except Exception as e:
-        import logging
-
-        logger = logging.getLogger(__name__)
         logger.error(f"Unexpected error in augment_image: {e}")
         return f"❌ Error: Image augmentation failed due to unexpected error. Please try again or contact support. Details: {e!s}"
 
@@ -438,6 +478,35 @@ def get_quick_transform_reference():
     }
 
 
+@functools.lru_cache(maxsize=1)
+def _build_transforms_payload() -> dict:
+    """Build the list_available_transforms response once per process.
+
+    The transform registry is static, so the formatted payload is cached.
+    The cached dict is shared, so tool wrappers hand out deep copies; use
+    ``_build_transforms_payload.cache_clear()`` if the registry changes.
+    """
+    transforms_info = get_available_transforms()
+
+    # Format for MCP response
+    transforms_list = [
+        {
+            "name": name,
+            "description": info.get("description", f"Apply {name} transformation"),
+            "example_phrases": info.get("example_phrases", []),
+            "parameters": info.get("default_parameters", {}),
+            "parameter_ranges": info.get("parameter_ranges", {}),
+        }
+        for name, info in transforms_info.items()
+    ]
+
+    return {
+        "transforms": transforms_list,
+        "total_count": len(transforms_list),
+        "message": f"Found {len(transforms_list)} available transforms",
+    }
+
+
 @mcp.tool()
 def list_available_transforms() -> dict:
     """List all available Albumentations transforms with descriptions.
@@ -446,42 +515,8 @@ def list_available_transforms() -> dict:
         Dictionary containing available transforms and their descriptions
     """
     try:
-        transforms_info = get_available_transforms()
-
-        # Format for MCP response
-        transforms_list = []
-        for name, info in transforms_info.items():
-            try:
-                transforms_list.append(
-                    {
-                        "name": name,
-                        "description": info.get(
-                            "description",
-                            f"Apply {name} transformation",
-                        ),
-                        "example_phrases": info.get("example_phrases", []),
-                        "parameters": info.get("default_parameters", {}),
-                        "parameter_ranges": info.get("parameter_ranges", {}),
-                    },
-                )
-            except Exception as transform_error:
-                import logging
-
-                logger = logging.getLogger(__name__)
-                logger.warning(
-                    f"Skipping transform {name} due to error: {transform_error}",
-                )
-                continue
-
-        return {
-            "transforms": transforms_list,
-            "total_count": len(transforms_list),
-            "message": f"Found {len(transforms_list)} available transforms",
-        }
+        return copy.deepcopy(_build_transforms_payload())
     except Exception as e:
-        import logging
-
-        logger = logging.getLogger(__name__)
         logger.error(f"Error retrieving transforms: {e}", exc_info=True)
         return {
             "transforms": [],
@@ -516,8 +551,6 @@ def validate_prompt(prompt: str) -> dict:
     try:
         # Use hook-integrated pipeline for validation
         # Using master async function to eliminate duplicate code
-        from .utils import run_async_safely
-
         result = run_async_safely(parse_prompt_with_hooks, prompt)
 
         # Convert pipeline result to validation format
@@ -567,8 +600,6 @@ def set_default_seed(seed: int | None = None) -> dict:
         }
 
     try:
-        from .utils.seed_utils import get_global_seed, set_global_seed
-
         # Set the default seed (using global_seed internally)
         set_global_seed(seed)
 
@@ -591,6 +622,38 @@ def set_default_seed(seed: int | None = None) -> dict:
         }
 
 
+@functools.lru_cache(maxsize=1)
+def _build_presets_payload() -> dict:
+    """Build the list_available_presets response once per process.
+
+    Preset definitions are static, so the formatted payload is cached.
+    The cached dict is shared, so tool wrappers hand out deep copies; use
+    ``_build_presets_payload.cache_clear()`` if the presets change.
+    """
+    presets_info = get_available_presets()
+
+    # Format for MCP response
+    presets_list = []
+    for name, config in presets_info.items():
+        presets_list.append(
+            {
+                "name": name,
+                "display_name": config["name"],
+                "description": config["description"],
+                "use_cases": config.get("use_cases", []),
+                "transforms_count": len(config["transforms"]),
+                "transforms": config["transforms"],  # Include actual transforms
+                "metadata": config.get("metadata", {}),
+            },
+        )
+
+    return {
+        "presets": presets_list,
+        "total_count": len(presets_list),
+        "message": f"Found {len(presets_list)} available presets",
+    }
+
+
 @mcp.tool()
 def list_available_presets() -> dict:
     """List all available preset configurations.
@@ -599,28 +662,7 @@ def list_available_presets() -> dict:
         Dictionary containing available presets and their descriptions
     """
     try:
-        presets_info = get_available_presets()
-
-        # Format for MCP response
-        presets_list = []
-        for name, config in presets_info.items():
-            presets_list.append(
-                {
-                    "name": name,
-                    "display_name": config["name"],
-                    "description": config["description"],
-                    "use_cases": config.get("use_cases", []),
-                    "transforms_count": len(config["transforms"]),
-                    "transforms": config["transforms"],  # Include actual transforms
-                    "metadata": config.get("metadata", {}),
-                },
-            )
-
-        return {
-            "presets": presets_list,
-            "total_count": len(presets_list),
-            "message": f"Found {len(presets_list)} available presets",
-        }
+        return copy.deepcopy(_build_presets_payload())
     except Exception as e:
         return {
             "presets": [],
@@ -631,17 +673,36 @@ def list_available_presets() -> dict:
 
 
 def _detect_image_source_type(image_source: str) -> str:
-    """Detect the type of image source (url, file, base64)."""
+    """Detect the type of image source (url, file, base64).
+
+    Only a short prefix is checked against the base64 alphabet, so
+    multi-megabyte payloads are classified without copying the whole string.
+    A long path can share that alphabet up to its extension, so a "." anywhere
+    (never valid base64) or an existing path still selects "file".
+    """
     if image_source.startswith(("http://", "https://")):
         return "url"
-    if image_source.startswith("data:image/") or (
-        len(image_source) > 100
-        and image_source.replace("=", "").replace("+", "").replace("/", "").isalnum()
-    ):
+    head = image_source[:_SOURCE_SNIFF_LENGTH]
+    if head.startswith("data:image/"):
+        return "base64"
+    if len(image_source) > 100 and head.translate(_B64_PUNCTUATION).isalnum():
+        if "." in image_source or (
+            len(image_source) <= _PATH_MAX and os.path.exists(image_source)
+        ):
+            return "file"
         return "base64"
     return "file"
 
 
+def _nonblank(value: str | None) -> bool:
+    """Return True if value has non-whitespace content.
+
+    Equivalent to ``bool(value and value.strip())`` but stops at the first
+    non-whitespace character instead of allocating a stripped copy.
+    """
+    return bool(value) and not value.isspace()
+
+
 def _detect_input_mode(
     image_path: str,
     image_b64: str,
@@ -657,14 +718,11 @@ def _detect_input_mode(
     Returns:
         Tuple of (mode, error_message) where mode is 'path', 'base64', or 'session'
     """
-    # Count non-empty inputs
-    inputs_provided = sum(
-        [
-            bool(image_path and image_path.strip()),
-            bool(image_b64 and image_b64.strip()),
-            bool(session_id and session_id.strip()),
-        ],
-    )
+    # Count non-blank inputs without copying a potentially huge base64 string
+    has_path = _nonblank(image_path)
+    has_b64 = _nonblank(image_b64)
+    has_session = _nonblank(session_id)
+    inputs_provided = has_path + has_b64 + has_session
 
     if inputs_provided == 0:
         return "", "Must provide either image_path, image_b64, or session_id"
@@ -672,14 +730,11 @@ def _detect_input_mode(
     if inputs_provided > 1:
         return "", "Provide only one of: image_path, image_b64, or session_id"
 
-    if image_path and image_path.strip():
+    if has_path:
         return "path", None
-    if image_b64 and image_b64.strip():
+    if has_b64:
         return "base64", None
-    if session_id and session_id.strip():
-        return "session", None
-
-    return "", "Invalid input parameters"
+    return "session", None
 
 
 def _load_image_from_input(
@@ -687,6 +742,7 @@ def _load_image_from_input(
     image_path: str,
     image_b64: str,
     session_id: str,
+    output_dir: str | None = None,
 ) -> tuple[str | None, str | None]:
     """Load and preprocess image based on input mode. Returns (image_b64, error_message)."""
     if mode == "path":
@@ -694,7 +750,7 @@ def _load_image_from_input(
     if mode == "base64":
         return _load_and_preprocess_from_base64(image_b64)
     if mode == "session":
-        return _load_session_image(session_id)
+        return _load_session_image(session_id, output_dir)
     return None, f"Unknown input mode: {mode}"
 
 
@@ -704,26 +760,21 @@ def _load_and_preprocess_from_file(
     """Load image from file path, optionally resize, then return as base64.
 
     Behavior:
-    - Always prefer decoding with PIL first, then validate dimensions/pixels.
+    - Read the image header with PIL first, then validate dimensions/pixels.
+    - JPEG/PNG/WebP files within limits are forwarded as-is without a
+      decode/re-encode round-trip.
     - In strict mode: reject oversized images with IMAGE_DIMENSIONS_TOO_LARGE.
     - In permissive mode: auto-resize to fit constraints, then encode once.
     - Error taxonomy: FILE_NOT_FOUND when path missing.
     """
     try:
-        from pathlib import Path
-
-        from PIL import Image
-
-        from .config import get_max_image_size, get_max_pixels_in, is_strict_mode
-        from .image_conversions import pil_to_base64
-
         # Validate file exists early
-        if not Path(image_path).exists():
+        path = Path(image_path)
+        if not path.exists():
             return None, f"FILE_NOT_FOUND: Image file not found: {image_path}"
 
-        # Decode with PIL
-        image = Image.open(image_path)
-        image.load()
+        # Open lazily: only the header is parsed until load()
+        image = Image.open(path)
 
         # Determine constraints
         max_dim = get_max_image_size()
@@ -733,6 +784,17 @@ def _load_and_preprocess_from_file(
         pixels = width * height
         oversized = width > max_dim or height > max_dim or pixels > max_pixels
 
+        if (
+            not oversized
+            and image.format in _PASSTHROUGH_FORMATS
+            and path.stat().st_size <= get_max_bytes_in()
+        ):
+            # Already compact and decodable downstream: forward the file bytes
+            image.close()
+            return base64.b64encode(path.read_bytes()).decode("ascii"), None
+
+        image.load()
+
         if oversized:
             if is_strict_mode():
                 return (
@@ -754,6 +816,19 @@ def _load_and_preprocess_from_file(
         return None, f"Failed to load image from file: {e}"
 
 
+def _verifies(image_data: bytes) -> bool:
+    """Check encoded image integrity without decoding pixels.
+
+    verify() consumes its handle, so the bytes are opened afresh.
+    """
+    try:
+        with Image.open(io.BytesIO(image_data)) as probe:
+            probe.verify()
+    except Exception:
+        return False
+    return True
+
+
 def _load_and_preprocess_from_base64(
     image_b64: str,
 ) -> tuple[str | None, str | None]:
@@ -762,25 +837,13 @@ def _load_and_preprocess_from_base64(
     Behavior:
     - Light transport sanity check on base64 length to prevent DoS.
     - Sanitize and decode; invalid base64 → B64_INVALID.
+    - JPEG/PNG/WebP input within limits is returned sanitized, skipping the
+      pixel decode and re-encode.
     - In strict mode: reject oversized images with IMAGE_DIMENSIONS_TOO_LARGE.
     - In permissive mode: auto-resize using thumbnail-like logic, then re-encode once.
     - Error taxonomy includes: B64_INVALID, B64_INPUT_TOO_LARGE, IMAGE_DIMENSIONS_TOO_LARGE.
     """
     try:
-        import base64
-        import io
-
-        from PIL import Image
-
-        from .config import (
-            get_max_bytes_in,
-            get_max_image_size,
-            get_max_pixels_in,
-            is_strict_mode,
-        )
-        from .image_conversions import pil_to_base64
-        from .utils.validation_utils import sanitize_base64_input
-
         # Transport sanity check before decode (very coarse)
         max_bytes = get_max_bytes_in()
         # Base64 expands ~4/3; reject only if clearly excessive to avoid DoS
@@ -800,16 +863,13 @@ def _load_and_preprocess_from_base64(
             return None, f"B64_INVALID: {e}"
 
         try:
-            image_data = base64.b64decode(clean_b64, validate=True)
+            image_data = b64decode(clean_b64, validate=True)
         except Exception as e:
             return None, f"B64_INVALID: Invalid base64 encoding ({e})"
 
-        # Decode to PIL
+        # Open lazily: only the header is parsed until load()
         try:
-            with io.BytesIO(image_data) as buffer:
-                image = Image.open(buffer)
-                image.load()
-                image = image.copy()
+            image = Image.open(io.BytesIO(image_data))
         except Exception as e:
             return None, f"B64_INVALID: Unable to open image from base64 ({e})"
 
@@ -821,6 +881,20 @@ def _load_and_preprocess_from_base64(
         pixels = width * height
         oversized = width > max_dim or height > max_dim or pixels > max_pixels
 
+        if (
+            not oversized
+            and image.format in _PASSTHROUGH_FORMATS
+            and len(image_data) <= max_bytes
+            and _verifies(image_data)
+        ):
+            # Already compact and decodable downstream: keep the sanitized input
+            return clean_b64, None
+
+        try:
+            image.load()
+        except Exception as e:
+            return None, f"B64_INVALID: Unable to open image from base64 ({e})"
+
         if oversized:
             if is_strict_mode():
                 return (
@@ -850,10 +924,6 @@ def _resize_image_smart(
 
     Uses high-quality downscaling and preserves aspect ratio.
     """
-    from math import sqrt
-
-    from PIL import Image
-
     width, height = image.size
     if width <= 0 or height <= 0:
         return image
@@ -877,12 +947,9 @@ def _resize_image_smart(
     return resized
 
 
-def _create_session_directory(session_id: str) -> str:
+def _create_session_directory(session_id: str, output_dir: str | None = None) -> str:
     """Create session directory with proper structure and return path."""
-    from pathlib import Path
-
-    output_dir = os.getenv("OUTPUT_DIR", "outputs")
-    out_path = Path(output_dir)
+    out_path = Path(output_dir or os.getenv("OUTPUT_DIR", "outputs"))
     out_path.mkdir(parents=True, exist_ok=True)
 
     # Reuse existing session directory if found (created by pipeline or prior tool)
@@ -899,14 +966,11 @@ def _create_session_directory(session_id: str) -> str:
         session_dir = existing[0]
     else:
         # Create session directory with timestamp format: YYYYMMDD_HHMMSS_sessionID
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        session_dir_name = f"{timestamp}_{session_id}"
-        session_dir = out_path / session_dir_name
-        session_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        session_dir = out_path / f"{timestamp}_{session_id}"
 
-    # Ensure tmp subdirectory exists
-    tmp_dir = session_dir / "tmp"
-    tmp_dir.mkdir(exist_ok=True)
+    # Ensure the session directory and its tmp subdirectory exist
+    (session_dir / "tmp").mkdir(parents=True, exist_ok=True)
 
     return str(session_dir)
 
@@ -930,16 +994,11 @@ def load_image_for_processing(image_source: str) -> str:
         return f"❌ Validation Error: {error}"
 
     try:
-        import uuid
-        from pathlib import Path
-
-        from .image_conversions import load_image_from_source
-
         # 1. Check input format
         source_type = _detect_image_source_type(image_source)
 
         # 2. Generate session ID
-        session_id = str(uuid.uuid4())[:8]
+        session_id = token_hex(4)
 
         # 3. Create session directory with proper structure
         session_dir = _create_session_directory(session_id)
@@ -950,17 +1009,17 @@ def load_image_for_processing(image_source: str) -> str:
         # 5. Load image (external function handles URL/file/base64 and saves temps)
         image = load_image_from_source(image_source, session_dir, temp_paths)
 
-        # 6. Save original image
-        image_filename = f"original_{session_id}.png"
-        image_path = Path(session_dir) / image_filename
-        image.save(image_path, format="PNG")
+        # 6. Save original image: JPEG for opaque photos, PNG keeps alpha/palette
+        if image.mode in ("RGB", "L"):
+            image_path = Path(session_dir) / f"original_{session_id}.jpg"
+            image.save(image_path, format="JPEG", quality=90)
+        else:
+            image_path = Path(session_dir) / f"original_{session_id}.png"
+            image.save(image_path, format="PNG")
 
         return f"✅ Image loaded and saved successfully!\n\n📁 Session ID: {session_id}\n📄 Source type: {source_type}\n📄 Image saved: {image_path}\n📄 Temp files tracked: {len(temp_paths)}\n\n🔄 Use augment_image with session_id='{session_id}' to process this image."
 
     except Exception as e:
-        import logging
-
-        logger = logging.getLogger(__name__)
         logger.error(f"Error loading image: {e}")
         return f"❌ Error: Failed to load image. Details: {e}"
 
@@ -1080,15 +1139,12 @@ def vlm_test_prompt(
         api_key = get_vlm_api_key()
 
         # Lazy import adapter to avoid import-time errors if deps missing
-        from PIL import Image
-
         from .vlm.google_gemini import GoogleGeminiClient
 
         client = GoogleGeminiClient(model=use_model, api_key=api_key)
 
-        # For MVP test, we don't use an input image; pass a tiny blank image placeholder
-        temp_img = Image.new("RGB", (16, 16), color=(0, 0, 0))
-        generated = client.apply(temp_img, prompt)
+        # Text-to-image generation; no input image is sent
+        generated = client.generate(prompt)
 
         # Save to OUTPUT_DIR/vlm_tests
         out_base = output_dir or os.getenv("OUTPUT_DIR", "outputs")
@@ -1129,7 +1185,7 @@ def vlm_generate_preview(
     return vlm_test_prompt(prompt=prompt, model=model, output_dir=output_dir)
 
 
-@mcp.tool()
+@_threaded_tool
 def vlm_apply(
     image_path: str = "",
     session_id: str = "",
@@ -1251,12 +1307,10 @@ def vlm_apply(
 
         # 4) Prepare hook context and reuse existing hooks (pre_save, post_transform, verify, post_save)
         # Ensure consistent session id
-        import uuid as _uuid
-
         from .hooks import HookContext, HookStage, execute_stage
         from .utils import run_async_safely
 
-        sid = session_id or str(_uuid.uuid4())[:8]
+        sid = session_id or token_hex(4)
 
         ctx = HookContext(
             session_id=sid,
@@ -1283,9 +1337,8 @@ def vlm_apply(
         # If caller provided an output_dir, pre-create a session directory there
         # and seed it into context so PreSaveHook reuses it.
         if output_dir:
-            os.environ["OUTPUT_DIR"] = output_dir
             try:
-                precreated_session = _create_session_directory(sid)
+                precreated_session = _create_session_directory(sid, output_dir)
                 ctx.metadata["session_dir"] = precreated_session
             except Exception:
                 # Non-fatal: PreSaveHook will fall back to its default output dir
@@ -1301,7 +1354,7 @@ def vlm_apply(
         ctx = res.context
 
         # Attach generated image to context for downstream hooks
-        ctx.augmented_image = pil_to_base64(generated_img).encode()
+        ctx.augmented_image = pil_to_base64(generated_img, fast=True).encode()
         ctx.metadata.update(
             {
                 "processing_result": {
@@ -2256,6 +2309,35 @@ def get_getting_started_guide() -> str:
     return json.dumps(guide, indent=2)
 
 
+@functools.lru_cache(maxsize=1)
+def _transforms_guide_json() -> str:
+    """Build the transforms_guide JSON once per process (content is static)."""
+    from .parser import get_available_transforms
+
+    transforms_info = get_available_transforms()
+
+    # Structure the data for easy consumption
+    guide = {
+        "metadata": {
+            "total_transforms": len(transforms_info),
+            "generated_at": "runtime",
+            "version": "1.0",
+        },
+        "transforms": {},
+    }
+
+    for name, info in transforms_info.items():
+        guide["transforms"][name] = {
+            "description": info.get("description", f"Apply {name} transformation"),
+            "example_phrases": info.get("example_phrases", []),
+            "default_parameters": info.get("default_parameters", {}),
+            "parameter_ranges": info.get("parameter_ranges", {}),
+            "category": _get_transform_category(name),
+        }
+
+    return json.dumps(guide, indent=2)
+
+
 @mcp.tool()
 @mcp.resource("file://transforms_guide")
 def transforms_guide() -> str:
@@ -2265,33 +2347,7 @@ def transforms_guide() -> str:
         Comprehensive guide to available transforms in JSON format
     """
     try:
-        import json
-
-        from .parser import get_available_transforms
-
-        transforms_info = get_available_transforms()
-
-        # Structure the data for easy consumption
-        guide = {
-            "metadata": {
-                "total_transforms": len(transforms_info),
-                "generated_at": "runtime",
-                "version": "1.0",
-            },
-            "transforms": {},
-        }
-
-        for name, info in transforms_info.items():
-            guide["transforms"][name] = {
-                "description": info.get("description", f"Apply {name} transformation"),
-                "example_phrases": info.get("example_phrases", []),
-                "default_parameters": info.get("default_parameters", {}),
-                "parameter_ranges": info.get("parameter_ranges", {}),
-                "category": _get_transform_category(name),
-            }
-
-        return json.dumps(guide, indent=2)
-
+        return _transforms_guide_json()
     except Exception as e:
         error_response = {
             "error": f"Failed to generate transforms guide: {e}",
@@ -2301,6 +2357,37 @@ def transforms_guide() -> str:
         return json.dumps(error_response, indent=2)
 
 
+@functools.lru_cache(maxsize=1)
+def _policy_presets_json() -> str:
+    """Build the policy_presets JSON once per process (content is static)."""
+    from .presets import get_available_presets
+
+    presets_info = get_available_presets()
+
+    # Structure the data with additional metadata
+    policy_guide = {
+        "metadata": {
+            "total_presets": len(presets_info),
+            "generated_at": "runtime",
+            "version": "1.0",
+        },
+        "presets": {},
+    }
+
+    for name, config in presets_info.items():
+        policy_guide["presets"][name] = {
+            "display_name": config.get("name", name.title()),
+            "description": config.get("description", f"{name.title()} preset"),
+            "use_cases": config.get("use_cases", []),
+            "transforms": config.get("transforms", []),
+            "metadata": config.get("metadata", {}),
+            "transform_count": len(config.get("transforms", [])),
+            "recommended_for": _get_preset_recommendations(name),
+        }
+
+    return json.dumps(policy_guide, indent=2)
+
+
 @mcp.tool()
 @mcp.resource("file://policy_presets")
 def policy_presets() -> str:
@@ -2310,35 +2397,7 @@ def policy_presets() -> str:
         Complete preset configurations in JSON format
     """
     try:
-        import json
-
-        from .presets import get_available_presets
-
-        presets_info = get_available_presets()
-
-        # Structure the data with additional metadata
-        policy_guide = {
-            "metadata": {
-                "total_presets": len(presets_info),
-                "generated_at": "runtime",
-                "version": "1.0",
-            },
-            "presets": {},
-        }
-
-        for name, config in presets_info.items():
-            policy_guide["presets"][name] = {
-                "display_name": config.get("name", name.title()),
-                "description": config.get("description", f"{name.title()} preset"),
-                "use_cases": config.get("use_cases", []),
-                "transforms": config.get("transforms", []),
-                "metadata": config.get("metadata", {}),
-                "transform_count": len(config.get("transforms", [])),
-                "recommended_for": _get_preset_recommendations(name),
-            }
-
-        return json.dumps(policy_guide, indent=2)
-
+        return _policy_presets_json()
     except Exception as e:
         error_response = {
             "error": f"Failed to generate policy presets: {e}",
@@ -2348,6 +2407,145 @@ def policy_presets() -> str:
         return json.dumps(error_response, indent=2)
 
 
+@functools.lru_cache(maxsize=1)
+def _available_transforms_examples_json() -> str:
+    """Build the available_transforms_examples JSON once per process (content is static)."""
+    examples = {
+        "metadata": {
+            "description": "Practical examples and usage patterns for image augmentations",
+            "version": "1.0",
+        },
+        "categories": {
+            "blur_effects": {
+                "description": "Various blur transformations",
+                "examples": [
+                    {
+                        "prompt": "add slight blur",
+                        "transforms": [
+                            {
+                                "name": "Blur",
+                                "parameters": {"blur_limit": 3},
+                            },
+                        ],
+                        "use_case": "Subtle image softening",
+                    },
+                    {
+                        "prompt": "motion blur effect",
+                        "transforms": [
+                            {
+                                "name": "MotionBlur",
+                                "parameters": {"blur_limit": 7},
+                            },
+                        ],
+                        "use_case": "Simulate camera movement",
+                    },
+                ],
+            },
+            "color_adjustments": {
+                "description": "Color and lighting modifications",
+                "examples": [
+                    {
+                        "prompt": "increase brightness and contrast",
+                        "transforms": [
+                            {
+                                "name": "RandomBrightnessContrast",
+                                "parameters": {
+                                    "brightness_limit": 0.2,
+                                    "contrast_limit": 0.2,
+                                },
+                            },
+                        ],
+                        "use_case": "Enhance image visibility",
+                    },
+                    {
+                        "prompt": "adjust colors",
+                        "transforms": [
+                            {
+                                "name": "HueSaturationValue",
+                                "parameters": {
+                                    "hue_shift_limit": 20,
+                                    "sat_shift_limit": 30,
+                                },
+                            },
+                        ],
+                        "use_case": "Color variation for training",
+                    },
+                ],
+            },
+            "geometric_transforms": {
+                "description": "Spatial transformations",
+                "examples": [
+                    {
+                        "prompt": "rotate image",
+                        "transforms": [
+                            {
+                                "name": "Rotate",
+                                "parameters": {"limit": 45},
+                            },
+                        ],
+                        "use_case": "Orientation variation",
+                    },
+                    {
+                        "prompt": "flip horizontally",
+                        "transforms": [
+                            {
+                                "name": "HorizontalFlip",
+                                "parameters": {"p": 1.0},
+                            },
+                        ],
+                        "use_case": "Mirror augmentation",
+                    },
+                ],
+            },
+            "noise_and_artifacts": {
+                "description": "Noise and distortion effects",
+                "examples": [
+                    {
+                        "prompt": "add noise",
+                        "transforms": [
+                            {
+                                "name": "GaussNoise",
+                                "parameters": {"var_limit": (10.0, 50.0)},
+                            },
+                        ],
+                        "use_case": "Simulate sensor noise",
+                    },
+                ],
+            },
+        },
+        "common_combinations": [
+            {
+                "name": "Basic Data Augmentation",
+                "prompt": "flip and rotate with slight color changes",
+                "transforms": [
+                    {"name": "HorizontalFlip", "parameters": {"p": 0.5}},
+                    {"name": "Rotate", "parameters": {"limit": 15}},
+                    {
+                        "name": "RandomBrightnessContrast",
+                        "parameters": {
+                            "brightness_limit": 0.1,
+                            "contrast_limit": 0.1,
+                        },
+                    },
+                ],
+            },
+            {
+                "name": "Photo Enhancement",
+                "prompt": "enhance contrast and reduce noise",
+                "transforms": [
+                    {"name": "CLAHE", "parameters": {"clip_limit": 4.0}},
+                    {
+                        "name": "RandomBrightnessContrast",
+                        "parameters": {"contrast_limit": 0.2},
+                    },
+                ],
+            },
+        ],
+    }
+
+    return json.dumps(examples, indent=2)
+
+
 @mcp.tool()
 @mcp.resource("file://available_transforms_examples")
 def available_transforms_examples() -> str:
@@ -2357,143 +2555,7 @@ def available_transforms_examples() -> str:
         Transform examples and usage patterns in JSON format
     """
     try:
-        import json
-
-        examples = {
-            "metadata": {
-                "description": "Practical examples and usage patterns for image augmentations",
-                "version": "1.0",
-            },
-            "categories": {
-                "blur_effects": {
-                    "description": "Various blur transformations",
-                    "examples": [
-                        {
-                            "prompt": "add slight blur",
-                            "transforms": [
-                                {
-                                    "name": "Blur",
-                                    "parameters": {"blur_limit": 3},
-                                },
-                            ],
-                            "use_case": "Subtle image softening",
-                        },
-                        {
-                            "prompt": "motion blur effect",
-                            "transforms": [
-                                {
-                                    "name": "MotionBlur",
-                                    "parameters": {"blur_limit": 7},
-                                },
-                            ],
-                            "use_case": "Simulate camera movement",
-                        },
-                    ],
-                },
-                "color_adjustments": {
-                    "description": "Color and lighting modifications",
-                    "examples": [
-                        {
-                            "prompt": "increase brightness and contrast",
-                            "transforms": [
-                                {
-                                    "name": "RandomBrightnessContrast",
-                                    "parameters": {
-                                        "brightness_limit": 0.2,
-                                        "contrast_limit": 0.2,
-                                    },
-                                },
-                            ],
-                            "use_case": "Enhance image visibility",
-                        },
-                        {
-                            "prompt": "adjust colors",
-                            "transforms": [
-                                {
-                                    "name": "HueSaturationValue",
-                                    "parameters": {
-                                        "hue_shift_limit": 20,
-                                        "sat_shift_limit": 30,
-                                    },
-                                },
-                            ],
-                            "use_case": "Color variation for training",
-                        },
-                    ],
-                },
-                "geometric_transforms": {
-                    "description": "Spatial transformations",
-                    "examples": [
-                        {
-                            "prompt": "rotate image",
-                            "transforms": [
-                                {
-                                    "name": "Rotate",
-                                    "parameters": {"limit": 45},
-                                },
-                            ],
-                            "use_case": "Orientation variation",
-                        },
-                        {
-                            "prompt": "flip horizontally",
-                            "transforms": [
-                                {
-                                    "name": "HorizontalFlip",
-                                    "parameters": {"p": 1.0},
-                                },
-                            ],
-                            "use_case": "Mirror augmentation",
-                        },
-                    ],
-                },
-                "noise_and_artifacts": {
-                    "description": "Noise and distortion effects",
-                    "examples": [
-                        {
-                            "prompt": "add noise",
-                            "transforms": [
-                                {
-                                    "name": "GaussNoise",
-                                    "parameters": {"var_limit": (10.0, 50.0)},
-                                },
-                            ],
-                            "use_case": "Simulate sensor noise",
-                        },
-                    ],
-                },
-            },
-            "common_combinations": [
-                {
-                    "name": "Basic Data Augmentation",
-                    "prompt": "flip and rotate with slight color changes",
-                    "transforms": [
-                        {"name": "HorizontalFlip", "parameters": {"p": 0.5}},
-                        {"name": "Rotate", "parameters": {"limit": 15}},
-                        {
-                            "name": "RandomBrightnessContrast",
-                            "parameters": {
-                                "brightness_limit": 0.1,
-                                "contrast_limit": 0.1,
-                            },
-                        },
-                    ],
-                },
-                {
-                    "name": "Photo Enhancement",
-                    "prompt": "enhance contrast and reduce noise",
-                    "transforms": [
-                        {"name": "CLAHE", "parameters": {"clip_limit": 4.0}},
-                        {
-                            "name": "RandomBrightnessContrast",
-                            "parameters": {"contrast_limit": 0.2},
-                        },
-                    ],
-                },
-            ],
-        }
-
-        return json.dumps(examples, indent=2)
-
+        return _available_transforms_examples_json()
     except Exception as e:
         error_response = {
             "error": f"Failed to generate transform examples: {e}",
@@ -2618,6 +2680,129 @@ def preset_pipelines_best_practices() -> str:
         return json.dumps(error_response, indent=2)
 
 
+@functools.lru_cache(maxsize=1)
+def _troubleshooting_common_issues_json() -> str:
+    """Build the troubleshooting_common_issues JSON once per process (content is static)."""
+    troubleshooting = {
+        "metadata": {
+            "title": "Image Augmentation Troubleshooting Guide",
+            "version": "1.0",
+        },
+        "common_issues": {
+            "parsing_errors": {
+                "symptoms": [
+                    "Prompt not recognized",
+                    "No transforms applied",
+                    "Unexpected results",
+                ],
+                "causes": [
+                    "Ambiguous natural language",
+                    "Unsupported transform names",
+                    "Typos in prompt",
+                ],
+                "solutions": [
+                    "Use specific transform names from the available list",
+                    "Try the validate_prompt tool to test your request",
+                    "Check spelling and use simple, clear language",
+                    "Use presets for common augmentation patterns",
+                ],
+                "examples": [
+                    "Instead of 'make it blurry', try 'add blur'",
+                    "Instead of 'change colors', try 'adjust hue and saturation'",
+                ],
+            },
+            "image_quality_issues": {
+                "symptoms": [
+                    "Artifacts in output",
+                    "Loss of detail",
+                    "Unnatural appearance",
+                ],
+                "causes": [
+                    "Excessive parameter values",
+                    "Incompatible transform combinations",
+                    "Poor quality input image",
+                ],
+                "solutions": [
+                    "Reduce transform intensity parameters",
+                    "Use presets designed for your use case",
+                    "Check input image quality and format",
+                    "Apply transforms gradually and validate results",
+                ],
+            },
+            "performance_issues": {
+                "symptoms": [
+                    "Slow processing",
+                    "Memory errors",
+                    "Timeouts",
+                ],
+                "causes": [
+                    "Large image files",
+                    "Complex transform pipelines",
+                    "Resource limitations",
+                ],
+                "solutions": [
+                    "Use file path input mode for large images",
+                    "Resize images before processing if appropriate",
+                    "Simplify transform pipelines",
+                    "Process images in smaller batches",
+                ],
+            },
+            "reproducibility_issues": {
+                "symptoms": [
+                    "Different results each time",
+                    "Cannot recreate specific output",
+                ],
+                "causes": [
+                    "Random seed not set",
+                    "Non-deterministic transforms",
+                    "Different processing environments",
+                ],
+                "solutions": [
+                    "Use the seed parameter for consistent results",
+                    "Set default seed with set_default_seed tool",
+                    "Document transform parameters for reproduction",
+                    "Use the same software versions",
+                ],
+            },
+        },
+        "diagnostic_steps": [
+            {
+                "step": 1,
+                "action": "Test with validate_prompt",
+                "description": "Verify your prompt is understood correctly",
+            },
+            {
+                "step": 2,
+                "action": "Check available transforms",
+                "description": "Use list_available_transforms to see supported operations",
+            },
+            {
+                "step": 3,
+                "action": "Try a preset",
+                "description": "Use a known-good preset to isolate issues",
+            },
+            {
+                "step": 4,
+                "action": "Simplify the request",
+                "description": "Start with a single transform and build up",
+            },
+            {
+                "step": 5,
+                "action": "Check logs",
+                "description": "Review error messages and warnings in the output",
+            },
+        ],
+        "getting_help": {
+            "documentation": "Check the transforms_guide resource tool for detailed parameter information",
+            "examples": "Use available_transforms_examples resource for usage patterns",
+            "presets": "Try policy_presets resource for pre-configured pipelines",
+            "validation": "Always use validate_prompt before processing important images",
+        },
+    }
+
+    return json.dumps(troubleshooting, indent=2)
+
+
 @mcp.tool()
 @mcp.resource("file://troubleshooting_common_issues")
 def troubleshooting_common_issues() -> str:
@@ -2627,127 +2812,7 @@ def troubleshooting_common_issues() -> str:
         Troubleshooting guide in JSON format
     """
     try:
-        import json
-
-        troubleshooting = {
-            "metadata": {
-                "title": "Image Augmentation Troubleshooting Guide",
-                "version": "1.0",
-            },
-            "common_issues": {
-                "parsing_errors": {
-                    "symptoms": [
-                        "Prompt not recognized",
-                        "No transforms applied",
-                        "Unexpected results",
-                    ],
-                    "causes": [
-                        "Ambiguous natural language",
-                        "Unsupported transform names",
-                        "Typos in prompt",
-                    ],
-                    "solutions": [
-                        "Use specific transform names from the available list",
-                        "Try the validate_prompt tool to test your request",
-                        "Check spelling and use simple, clear language",
-                        "Use presets for common augmentation patterns",
-                    ],
-                    "examples": [
-                        "Instead of 'make it blurry', try 'add blur'",
-                        "Instead of 'change colors', try 'adjust hue and saturation'",
-                    ],
-                },
-                "image_quality_issues": {
-                    "symptoms": [
-                        "Artifacts in output",
-                        "Loss of detail",
-                        "Unnatural appearance",
-                    ],
-                    "causes": [
-                        "Excessive parameter values",
-                        "Incompatible transform combinations",
-                        "Poor quality input image",
-                    ],
-                    "solutions": [
-                        "Reduce transform intensity parameters",
-                        "Use presets designed for your use case",
-                        "Check input image quality and format",
-                        "Apply transforms gradually and validate results",
-                    ],
-                },
-                "performance_issues": {
-                    "symptoms": [
-                        "Slow processing",
-                        "Memory errors",
-                        "Timeouts",
-                    ],
-                    "causes": [
-                        "Large image files",
-                        "Complex transform pipelines",
-                        "Resource limitations",
-                    ],
-                    "solutions": [
-                        "Use file path input mode for large images",
-                        "Resize images before processing if appropriate",
-                        "Simplify transform pipelines",
-                        "Process images in smaller batches",
-                    ],
-                },
-                "reproducibility_issues": {
-                    "symptoms": [
-                        "Different results each time",
-                        "Cannot recreate specific output",
-                    ],
-                    "causes": [
-                        "Random seed not set",
-                        "Non-deterministic transforms",
-                        "Different processing environments",
-                    ],
-                    "solutions": [
-                        "Use the seed parameter for consistent results",
-                        "Set default seed with set_default_seed tool",
-                        "Document transform parameters for reproduction",
-                        "Use the same software versions",
-                    ],
-                },
-            },
-            "diagnostic_steps": [
-                {
-                    "step": 1,
-                    "action": "Test with validate_prompt",
-                    "description": "Verify your prompt is understood correctly",
-                },
-                {
-                    "step": 2,
-                    "action": "Check available transforms",
-                    "description": "Use list_available_transforms to see supported operations",
-                },
-                {
-                    "step": 3,
-                    "action": "Try a preset",
-                    "description": "Use a known-good preset to isolate issues",
-                },
-                {
-                    "step": 4,
-                    "action": "Simplify the request",
-                    "description": "Start with a single transform and build up",
-                },
-                {
-                    "step": 5,
-                    "action": "Check logs",
-                    "description": "Review error messages and warnings in the output",
-                },
-            ],
-            "getting_help": {
-                "documentation": "Check the transforms_guide resource tool for detailed parameter information",
-                "examples": "Use available_transforms_examples resource for usage patterns",
-                "presets": "Try policy_presets resource for pre-configured pipelines",
-                "validation": "Always use validate_prompt before processing important images",
-            },
-        }
-
-        return json.dumps(troubleshooting, indent=2)
-
+        return _troubleshooting_common_issues_json()
     except Exception as e:
         error_response = {
             "error": f"Failed to generate troubleshooting guide: {e}",
@@ -2811,6 +2876,16 @@ def _get_preset_recommendations(preset_name: str) -> list[str]:
     return recommendations.get(preset_name, [])
 
 
+def _install_uvloop() -> None:
+    """Use uvloop for the server and background loops when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using uvloop event loop policy")
+
+
 def main():
     """Main entry point for the MCP server."""
     # Validate configuration on startup
@@ -2818,13 +2893,14 @@ def main():
 
     try:
         validate_config_on_startup()
-        logger = logging.getLogger(__name__)
         logger.info("Starting albumentations-mcp server")
         logger.info(get_config_summary())
     except Exception as e:
         print(f"❌ Configuration Error: {e}", file=sys.stderr)
         sys.exit(1)
 
+    _install_uvloop()
+
     # Run the MCP server using stdio for Kiro integration
     mcp.run("stdio")
 
@@ -1,9 +1,11 @@
 """Async execution utilities to eliminate duplicate asyncio patterns."""
 
 import asyncio
+import atexit
 import concurrent.futures
 import functools
 import logging
+import threading
 from collections.abc import Callable
 from typing import Any, TypeVar
 
@@ -11,11 +13,56 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Each calling thread reuses its own event loop (via asyncio.Runner), so sync
+# callers skip per-call loop setup without funnelling every coroutine through
+# one shared loop, where CPU-bound hooks would serialise concurrent tools
+_THREAD_STATE = threading.local()
+_RUNNERS: list[asyncio.Runner] = []
+_RUNNERS_LOCK = threading.Lock()
+
+# Used when run_async_safely is called from a thread whose loop is running
+_EXECUTOR = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="run_async")
+
+
+def _get_thread_runner() -> asyncio.Runner:
+    """Return the calling thread's runner, creating it on first use."""
+    runner = getattr(_THREAD_STATE, "runner", None)
+    if runner is None:
+        runner = asyncio.Runner()
+        _THREAD_STATE.runner = runner
+        with _RUNNERS_LOCK:
+            if not _RUNNERS:
+                atexit.register(_close_thread_runners)
+            _RUNNERS.append(runner)
+    return runner
+
+
+def _close_thread_runners() -> None:
+    """Close every per-thread runner that is not currently running."""
+    with _RUNNERS_LOCK:
+        runners = list(_RUNNERS)
+        _RUNNERS.clear()
+    for runner in runners:
+        try:
+            runner.close()
+        except RuntimeError:
+            # Still running on a thread that outlived the interpreter exit
+            logger.debug("Skipped closing a busy event loop runner")
+
+
+def _run_on_thread_runner(async_func: Callable, *args: Any) -> Any:
+    """Run a coroutine to completion on the calling thread's own loop."""
+    return _get_thread_runner().run(async_func(*args))
+
 
 def run_async_safely(async_func: Callable, *args: Any) -> Any:
     """Helper to run async functions safely, handling event loop issues.
 
     This eliminates duplicate asyncio handling patterns across the codebase.
+    Each thread keeps one event loop for its calls, so callers neither pay
+    for creating and closing a loop per call nor contend with other threads
+    for a shared one. Callers already inside a running loop (e.g. a FastMCP
+    tool) have the coroutine run on a worker thread instead.
 
     Args:
         async_func: The async function to run
@@ -25,15 +72,11 @@ def run_async_safely(async_func: Callable, *args: Any) -> Any:
         Result from the async function
     """
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, async_func(*args))
-                return future.result()
-        else:
-            return asyncio.run(async_func(*args))
+        asyncio.get_running_loop()
     except RuntimeError:
-        return asyncio.run(async_func(*args))
+        return _run_on_thread_runner(async_func, *args)
+    # Blocking a running loop on itself would deadlock
+    return _EXECUTOR.submit(_run_on_thread_runner, async_func, *args).result()
 
 
 def timed_operation(operation_name: str | None = None):
@@ -7,6 +7,7 @@ operations, format validation, and low-level conversions.
 
 import base64
 import binascii
+import functools
 import io
 import logging
 import os
@@ -14,6 +15,14 @@ from typing import Any
 
 from PIL import Image
 
+from ..errors import ImageConversionError, ImageValidationError
+
+# Optional SIMD-accelerated base64 codec with the same API as the stdlib
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
 logger = logging.getLogger(__name__)
 
 # Configuration - can be overridden by environment variables
@@ -25,20 +34,59 @@ MAX_IMAGE_SIZE = (
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", str(50 * 1024 * 1024)))
 MAX_PIXELS = int(os.getenv("MAX_PIXELS", str(89_478_485)))  # PIL default
 
+# Decompression bomb protection for every PIL decode in the process
+Image.MAX_IMAGE_PIXELS = MAX_PIXELS
+
+# Sources at least this long are never treated as file paths; stat() on a
+# large base64 payload fails with ENAMETOOLONG (Linux PATH_MAX)
+_MAX_PATH_LENGTH = 4096
+
+# Recently downloaded URLs kept in memory; at most this many times
+# MAX_FILE_SIZE bytes
+_URL_CACHE_SIZE = 8
+
+# Modes returned unchanged by normalize_image_mode
+_PASSTHROUGH_MODES = frozenset({"RGB", "RGBA"})
+
+
+def b64decode(data: str | bytes, validate: bool = False) -> bytes:
+    """Decode base64 data, using pybase64 when it is installed.
+
+    Raises the same ``binascii.Error`` as ``base64.b64decode`` on bad input.
+    """
+    if pybase64 is not None:
+        return pybase64.b64decode(data, validate=validate)
+    return base64.b64decode(data, validate=validate)
+
+
+def b64_decoded_size(data: str) -> int:
+    """Return the byte length ``data`` decodes to, without decoding it.
+
+    Exact for padded base64 with no embedded whitespace (anything that
+    passes ``validate=True``); an estimate otherwise.
+    """
+    return len(data) * 3 // 4 - data[-2:].count("=")
+
 
 def decode_image_data(image_b64: str) -> bytes:
     """Safely decode base64 image data with size validation."""
+    if image_b64.startswith("data:"):
+        image_b64 = image_b64.partition(",")[2]
+
+    # Reject oversized payloads before allocating the decoded buffer
+    decoded_size = b64_decoded_size(image_b64)
+    if decoded_size > MAX_FILE_SIZE:
+        raise ImageValidationError(
+            f"Image file too large: {decoded_size} bytes (max: {MAX_FILE_SIZE})",
+        )
+
     try:
-        image_data = base64.b64decode(image_b64, validate=True)
+        image_data = b64decode(image_b64, validate=True)
     except (binascii.Error, ValueError) as e:
-        from ..errors import ImageConversionError
-
         raise ImageConversionError(f"Invalid base64 encoding: {e!s}")
 
     # Check file size before processing
     if len(image_data) > MAX_FILE_SIZE:
-        from ..errors import ImageValidationError
-
         raise ImageValidationError(
             f"Image file too large: {len(image_data)} bytes (max: {MAX_FILE_SIZE})",
         )
@@ -49,52 +97,36 @@ def decode_image_data(image_b64: str) -> bytes:
 def load_image_safely(image_data: bytes) -> Image.Image:
     """Safely load PIL Image with decompression bomb protection."""
     try:
-        # Set decompression bomb protection
-        Image.MAX_IMAGE_PIXELS = MAX_PIXELS
-
-        # Use BytesIO context manager for proper cleanup
-        with io.BytesIO(image_data) as buffer:
-            image = Image.open(buffer)
-
-            # Verify image before loading
-            if hasattr(image, "size") and image.size:
-                width, height = image.size
-                if width * height > MAX_PIXELS:
-                    from ..errors import ImageConversionError
-
-                    raise ImageConversionError(
-                        f"Image too large: {width}x{height} pixels (max: {MAX_PIXELS})",
-                    )
-
-            # Force loading to catch truncated/corrupted images
-            image.load()
-            image_copy = image.copy()
+        # The buffer is left open: the image keeps it as its file object, so
+        # returning the loaded image avoids copying every pixel out of it
+        image = Image.open(io.BytesIO(image_data))
+
+        # Verify image before loading
+        if hasattr(image, "size") and image.size:
+            width, height = image.size
+            if width * height > MAX_PIXELS:
+                raise ImageConversionError(
+                    f"Image too large: {width}x{height} pixels (max: {MAX_PIXELS})",
+                )
 
-        return image_copy
+        # Force loading to catch truncated/corrupted images
+        image.load()
+        return image
 
     except OSError as e:
-        from ..errors import ImageConversionError
-
         raise ImageConversionError(f"Cannot open image: {e!s}")
     except Image.DecompressionBombError as e:
-        from ..errors import ImageConversionError
-
         raise ImageConversionError(f"Image too large (decompression bomb): {e!s}")
 
 
 def normalize_image_mode(image: Image.Image) -> Image.Image:
     """Normalize image mode to RGB or RGBA."""
-    if image.mode in ("RGB", "RGBA"):
+    if image.mode in _PASSTHROUGH_MODES:
         return image
 
-    if image.mode in ("P", "L", "LA"):
-        return image.convert("RGB")
-
     try:
         return image.convert("RGB")
     except Exception as e:
-        from ..errors import ImageConversionError
-
         raise ImageConversionError(
             f"Cannot convert image mode '{image.mode}' to RGB: {e!s}",
         )
@@ -114,13 +146,9 @@ def get_image_info(image: Image.Image) -> dict[str, Any]:
     """Get comprehensive information about a PIL Image."""
     # Basic validation without circular dependency
     if not isinstance(image, Image.Image):
-        from ..errors import ImageValidationError
-
         raise ImageValidationError("Input must be a PIL Image object")
 
     if not hasattr(image, "size") or not image.size:
-        from ..errors import ImageValidationError
-
         raise ImageValidationError("Image has no size information")
 
     info = {
@@ -140,30 +168,72 @@ def get_image_info(image: Image.Image) -> dict[str, Any]:
 def validate_image_dimensions(image: Image.Image) -> None:
     """Validate image dimensions without full validation chain."""
     if not isinstance(image, Image.Image):
-        from ..errors import ImageValidationError
-
         raise ImageValidationError("Input must be a PIL Image object")
 
     if not hasattr(image, "size") or not image.size:
-        from ..errors import ImageValidationError
-
         raise ImageValidationError("Image has no size information")
 
     width, height = image.size
     if width <= 0 or height <= 0:
-        from ..errors import ImageValidationError
-
         raise ImageValidationError(f"Invalid image dimensions: {width}x{height}")
 
     if width > MAX_IMAGE_SIZE[0] or height > MAX_IMAGE_SIZE[1]:
-        from ..errors import ImageValidationError
+        raise ImageValidationError(
+            f"Image too large: {width}x{height} "
+            f"(max: {MAX_IMAGE_SIZE[0]}x{MAX_IMAGE_SIZE[1]})",
+        )
+
+
+def validate_array_dimensions(array: Any) -> None:
+    """Validate an (H, W) or (H, W, C) image array's dimensions."""
+    import numpy as np
+
+    if not isinstance(array, np.ndarray):
+        raise ImageValidationError("Input must be a numpy array")
 
+    if array.ndim not in (2, 3):
+        raise ImageValidationError(
+            f"Image array must be 2D or 3D, got shape {array.shape}",
+        )
+
+    height, width = array.shape[:2]
+    if width <= 0 or height <= 0:
+        raise ImageValidationError(f"Invalid image dimensions: {width}x{height}")
+
+    if width > MAX_IMAGE_SIZE[0] or height > MAX_IMAGE_SIZE[1]:
         raise ImageValidationError(
             f"Image too large: {width}x{height} "
             f"(max: {MAX_IMAGE_SIZE[0]}x{MAX_IMAGE_SIZE[1]})",
         )
 
 
+@functools.lru_cache(maxsize=_URL_CACHE_SIZE)
+def _fetch_url_bytes(url: str) -> bytes:
+    """Download an image URL, caching the raw bytes of recent URLs.
+
+    Bytes are cached rather than images so callers never share a mutable
+    PIL object. Failed downloads raise and are not cached.
+    """
+    import urllib.request
+
+    request = urllib.request.Request(url, headers={"Accept-Encoding": "identity"})
+    with urllib.request.urlopen(request) as response:
+        # Reject oversized downloads up front when the size is known,
+        # and never buffer more than the limit when it is not
+        content_length = response.headers.get("Content-Length")
+        if content_length and int(content_length) > MAX_FILE_SIZE:
+            raise ValueError(
+                f"Remote image too large: {content_length} bytes "
+                f"(max: {MAX_FILE_SIZE})",
+            )
+        image_data = response.read(MAX_FILE_SIZE + 1)
+        if len(image_data) > MAX_FILE_SIZE:
+            raise ValueError(
+                f"Remote image too large: more than {MAX_FILE_SIZE} bytes",
+            )
+    return image_data
+
+
 def load_image_from_source(
     image_source: str,
     session_dir: str = None,
@@ -186,7 +256,6 @@ def load_image_from_source(
         ImageConversionError: If image cannot be loaded
         ImageValidationError: If image is invalid
     """
-    import urllib.request
     from pathlib import Path
 
     source = image_source.strip()
@@ -195,8 +264,7 @@ def load_image_from_source(
     if source.startswith(("http://", "https://")):
         try:
             logger.info(f"Loading image from URL: {source}")
-            with urllib.request.urlopen(source) as response:
-                image_data = response.read()
+            image_data = _fetch_url_bytes(source)
 
             with io.BytesIO(image_data) as buffer:
                 image = Image.open(buffer)
@@ -213,19 +281,19 @@ def load_image_from_source(
                 logger.debug(f"Saved URL image to temp: {temp_path}")
 
         except Exception as e:
-            from ..errors import ImageConversionError
-
             raise ImageConversionError(f"Failed to load image from URL: {e}")
 
     # Check if it's a file path
-    elif Path(source).exists():
+    elif (
+        len(source) < _MAX_PATH_LENGTH
+        and not source.startswith("data:")
+        and Path(source).exists()
+    ):
         try:
             logger.info(f"Loading image from file: {source}")
 
             # Validate path security
             if not _validate_path_security(source, session_dir):
-                from ..errors import ImageValidationError
-
                 raise ImageValidationError(f"Invalid or unsafe file path: {source}")
 
             image = Image.open(source)
@@ -246,8 +314,6 @@ def load_image_from_source(
                 logger.debug(f"Saved pasted image to temp: {temp_path}")
 
         except Exception as e:
-            from ..errors import ImageConversionError
-
             raise ImageConversionError(f"Failed to load image from file: {e}")
 
     # Assume it's base64 data
@@ -262,18 +328,16 @@ def load_image_from_source(
     validate_image_dimensions(image)
 
     # Convert to RGB if needed
-    if image.mode not in ("RGB", "RGBA"):
-        logger.debug(f"Converting image from {image.mode} to RGB")
-        image = image.convert("RGB")
-
-    return image
+    return normalize_image_mode(image)
 
 
-def validate_image(image: Image.Image) -> None:
+def validate_image(image: Image.Image, check_array: bool = True) -> None:
     """Full image validation with comprehensive checks.
 
     Args:
         image: PIL Image to validate
+        check_array: Also verify the image's mode converts to a numpy array.
+            Only a single pixel is converted, so the check stays cheap.
 
     Raises:
         ImageValidationError: If image is invalid
@@ -281,22 +345,21 @@ def validate_image(image: Image.Image) -> None:
     validate_image_dimensions(image)
 
     try:
-        # Check if image data is accessible
-        image.getpixel((0, 0))
+        # Check if image data is accessible; a no-op once pixels are loaded
+        image.load()
     except Exception:
-        from ..errors import ImageValidationError
-
         raise ImageValidationError("Cannot access image pixel data")
 
     # Verify image can be converted to array
-    try:
-        import numpy as np
-
-        np.array(image)
-    except Exception as e:
-        from ..errors import ImageValidationError
+    if check_array:
+        try:
+            import numpy as np
 
-        raise ImageValidationError(f"Cannot convert image to numpy array: {e!s}")
+            # Conversion support depends on the mode, not the pixels, so a
+            # 1x1 crop proves it without copying the whole frame
+            np.asarray(image.crop((0, 0, 1, 1)))
+        except Exception as e:
+            raise ImageValidationError(f"Cannot convert image to numpy array: {e!s}")
 
     logger.debug(
         f"Image validation passed: {image.size[0]}x{image.size[1]}, mode: {image.mode}",
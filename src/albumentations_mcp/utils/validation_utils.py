@@ -3,6 +3,9 @@
 import re
 from typing import Any
 
+# Longest data URL header ("data:image/...;base64,") accepted before the payload
+_DATA_URL_HEADER_MAX = 256
+
 
 def sanitize_base64_input(image_b64: str) -> str:
     """Master function for base64 sanitization - eliminates duplicates.
@@ -22,11 +25,13 @@ def sanitize_base64_input(image_b64: str) -> str:
     if not image_b64 or not isinstance(image_b64, str):
         raise ValueError("Image data must be a non-empty string")
 
-    # Remove data URL prefix if present
+    # Remove data URL prefix if present; the header comma is searched for only
+    # within a bounded window rather than across the whole payload
     if image_b64.startswith("data:image/"):
-        if "," not in image_b64:
+        comma = image_b64.find(",", 0, _DATA_URL_HEADER_MAX)
+        if comma < 0:
             raise ValueError("Invalid data URL format")
-        image_b64 = image_b64.split(",", 1)[1]
+        image_b64 = image_b64[comma + 1 :]
 
     # Validate base64 string
     clean_b64 = image_b64.strip()
@@ -10,17 +10,24 @@ error messages and graceful degradation strategies.
 
 """
 
-import base64
 import binascii
 import io
 import logging
 import os
 import re
+import threading
 import unicodedata
+from collections import OrderedDict
 from typing import Any
 
 from PIL import Image
 
+# Optional RE2 engine: linear-time matching for patterns run on user input
+try:
+    import re2
+except ImportError:
+    re2 = None
+
 from .errors import (
     ImageValidationError,
     PromptValidationError,
@@ -28,6 +35,8 @@ from .errors import (
     SecurityValidationError,
     ValidationError,
 )
+from .utils.image_handler import b64_decoded_size, b64decode
+from .utils.validation_utils import _DATA_URL_HEADER_MAX
 
 logger = logging.getLogger(__name__)
 
@@ -40,28 +49,33 @@ MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "50"))
 MAX_FILE_SIZE = MAX_FILE_SIZE_MB * 1024 * 1024
 PROCESSING_TIMEOUT_SECONDS = int(os.getenv("PROCESSING_TIMEOUT_SECONDS", "300"))
 
+# Decompression bomb protection, set once rather than on every validation
+Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
 # Supported image formats
 SUPPORTED_FORMATS = {"PNG", "JPEG", "JPG", "WEBP", "TIFF", "BMP", "GIF"}
 
 # Security patterns
+# The SQL keyword pattern is the only one made of letters and whitespace
+SQL_KEYWORD_PATTERN = r"(?:union|select|insert|update|delete|drop)\s+"
+
+# Script tags; RE2 matches the unbounded body in linear time, while the re
+# fallback bounds it by the longest prompt accepted, so any script span a
+# valid prompt can contain is still caught (RE2 rejects repeats over 1000)
+SCRIPT_TAG_PATTERN = r"<script[^>]{0,100}>.*?</script>"
+SCRIPT_TAG_PATTERN_BOUNDED = (
+    rf"<script[^>]{{0,100}}>.{{0,{MAX_PROMPT_LENGTH}}}?</script>"
+)
+
 # Enhanced security patterns with ReDoS protection
 SUSPICIOUS_PATTERNS = [
     # Script injection patterns
-    r"<script[^>]{0,100}>.*?</script>",  # Script tags (limited quantifier)
-    r"javascript:[^\s]{0,200}",  # JavaScript URLs (limited length)
-    r"data:text/html[^\s]{0,200}",  # HTML data URLs (limited length)
-    r"vbscript:[^\s]{0,200}",  # VBScript URLs (limited length)
-    # File system access patterns
-    r"file://[^\s]{0,200}",  # File URLs (limited length)
-    r"\\\\[^\s]{0,100}",  # UNC paths (limited length)
-    # Path traversal patterns (with limits to prevent ReDoS)
-    r"(?:\.\./){1,10}",  # Unix path traversal (limited repetition)
-    r"(?:\.\.\\){1,10}",  # Windows path traversal (limited repetition)
+    SCRIPT_TAG_PATTERN,  # Script tags
     # Command injection patterns
     r"[;&|`$(){}[\]]{2,}",  # Multiple shell metacharacters
     r"(?:cmd|powershell|bash|sh)\s+[/\-]",  # Command execution attempts
     # SQL injection patterns
-    r"(?:union|select|insert|update|delete|drop)\s+",  # SQL keywords
+    SQL_KEYWORD_PATTERN,  # SQL keywords
     r"['\"];?\s*(?:--|\#|/\*)",  # SQL comment patterns
     # LDAP injection patterns
     r"[()&|!*][\w\s]{0,50}[()&|!*]",  # LDAP filter metacharacters
@@ -73,11 +87,40 @@ SUSPICIOUS_PATTERNS = [
     r"\{%[^%]{0,100}%\}",  # Template blocks (limited length)
 ]
 
+# Every pattern except SQL_KEYWORD_PATTERN needs at least one of these
+# characters, so inputs without any skip the rest of the pattern scan
+SUSPICIOUS_TRIGGER_REGEX = re.compile(r"[<;&|`$(){}\[\]/\-'\"!*]")
+
+# Suspicious fixed strings, matched with substring checks rather than regex.
+# URL schemes are matched case-insensitively and all contain ":"
+SUSPICIOUS_SCHEMES = ("javascript:", "data:text/html", "vbscript:", "file://")
+SUSPICIOUS_LITERALS = (
+    "\\\\",  # UNC paths
+    "../",  # Unix path traversal
+    "..\\",  # Windows path traversal
+)
+
+
+def _compile_suspicious_pattern(pattern: str) -> Any:
+    """Compile a case-insensitive pattern, preferring RE2 when installed."""
+    if re2 is not None:
+        options = re2.Options()
+        options.case_sensitive = False
+        options.log_errors = False
+        try:
+            return re2.compile(pattern, options)
+        except re2.error as e:
+            logger.debug(f"RE2 cannot compile {pattern}, using re: {e}")
+    if pattern == SCRIPT_TAG_PATTERN:
+        pattern = SCRIPT_TAG_PATTERN_BOUNDED
+    return re.compile(pattern, re.IGNORECASE)
+
+
 # Compile patterns for performance with timeout protection
 SUSPICIOUS_REGEX = []
 for pattern in SUSPICIOUS_PATTERNS:
     try:
-        compiled = re.compile(pattern, re.IGNORECASE)
+        compiled = _compile_suspicious_pattern(pattern)
         # Test pattern with a potentially problematic string to catch ReDoS
         test_string = "a" * 1000
         compiled.search(test_string)
@@ -85,9 +128,32 @@ for pattern in SUSPICIOUS_PATTERNS:
     except (re.error, Exception) as e:
         logger.warning(f"Skipping problematic regex pattern {pattern}: {e}")
 
+# Regex source fragments with nested quantifiers (catastrophic backtracking)
+REDOS_SUBSTRINGS = (
+    r"(\w+)+",
+    r"(\d+)*",
+    r"(.+)+",
+    r"(.*)*",
+    r"(a+)+",
+    r"(a*)*",
+)
+
+# Characters that are neither alphanumeric (str.isalnum) nor whitespace;
+# \w also matches "_", which isalnum() does not, so it is added back
+PUNCTUATION_REGEX = re.compile(r"[^\w\s]|_")
+ASCII_PUNCTUATION = bytes(
+    i for i in range(128) if not (chr(i).isalnum() or chr(i).isspace())
+)
+
 # Additional security constants
 SECURITY_TIMEOUT_SECONDS = 1.0  # Timeout for regex operations
 
+# Successful prompt validations, keyed by prompt and the limits they were
+# checked against; failures are never cached so they always raise afresh
+PROMPT_CACHE_SIZE = 256
+_prompt_cache: OrderedDict[tuple, dict[str, Any]] = OrderedDict()
+_prompt_cache_lock = threading.Lock()
+
 
 # Get configurable security check length
 def _get_max_security_check_length() -> int:
@@ -108,15 +174,21 @@ def validate_base64_image(
     image_b64: str,
     strict: bool = True,
     skip_security_length_check: bool = False,
+    deep_decode: bool = False,
 ) -> dict[str, Any]:
     """Validate Base64 image data with comprehensive edge case handling.
 
     Args:
         image_b64: Base64 encoded image string
         strict: If True, raises exceptions on validation failures
+        skip_security_length_check: Skip the security scan's length limit
+        deep_decode: Fully decode the pixels to detect corruption. By default
+            only the container is checked with ``Image.verify()``, which is
+            enough for callers that decode the image themselves afterwards
 
     Returns:
-        Dictionary with validation results and metadata
+        Dictionary with validation results and metadata; ``decoded_data``
+        holds the decoded bytes so callers need not decode them again
 
     Raises:
         ImageValidationError: If validation fails and strict=True
@@ -129,6 +201,7 @@ def validate_base64_image(
         "warnings": [],
         "metadata": {},
         "sanitized_data": None,
+        "decoded_data": None,
     }
 
     try:
@@ -136,6 +209,15 @@ def validate_base64_image(
         if not _validate_basic_input(image_b64, validation_result, strict):
             return validation_result
 
+        # Reject oversized payloads from their length alone, before the
+        # security scan walks them; the exact check runs on the decoded bytes
+        if not _validate_file_size(
+            _estimate_decoded_size(image_b64),
+            validation_result,
+            strict,
+        ):
+            return validation_result
+
         # Step 2: Security validation (can skip length check for image data)
         _validate_security(image_b64, skip_length_check=skip_security_length_check)
 
@@ -143,13 +225,19 @@ def validate_base64_image(
         decoded_data = _sanitize_and_decode_base64(image_b64, validation_result, strict)
         if decoded_data is None:
             return validation_result
+        validation_result["decoded_data"] = decoded_data
 
         # Step 4: Check file size limits
-        if not _validate_file_size(decoded_data, validation_result, strict):
+        if not _validate_file_size(len(decoded_data), validation_result, strict):
             return validation_result
 
         # Step 5: Validate image format and structure
-        if not _validate_image_structure(decoded_data, validation_result, strict):
+        if not _validate_image_structure(
+            decoded_data,
+            validation_result,
+            strict,
+            deep_decode,
+        ):
             return validation_result
 
         # Step 6: Memory usage estimation and final checks
@@ -191,6 +279,20 @@ def _validate_basic_input(
     return True
 
 
+def _estimate_decoded_size(image_b64: str) -> int:
+    """Estimate the decoded size of raw input without copying or decoding it.
+
+    Leaves out a data URL header and any whitespace, so neither pushes a
+    payload that fits under the size limit over it.
+    """
+    start = 0
+    if image_b64.startswith("data:"):
+        start = image_b64.find(",", 0, _DATA_URL_HEADER_MAX) + 1
+    whitespace = sum(image_b64.count(char, start) for char in " \t\r\n")
+    padding = image_b64[-8:].rstrip()[-2:].count("=")
+    return (len(image_b64) - start - whitespace) * 3 // 4 - padding
+
+
 def _sanitize_and_decode_base64(
     image_b64: str,
     validation_result: dict[str, Any],
@@ -208,8 +310,12 @@ def _sanitize_and_decode_base64(
             raise
         return None
 
+    # Reject oversized payloads before allocating the decoded buffer
+    if not _validate_file_size(b64_decoded_size(clean_b64), validation_result, strict):
+        return None
+
     try:
-        decoded_data = base64.b64decode(clean_b64, validate=True)
+        decoded_data = b64decode(clean_b64, validate=True)
     except (binascii.Error, ValueError) as e:
         error = f"Invalid Base64 encoding: {e!s}"
         validation_result["error"] = error
@@ -230,12 +336,11 @@ def _sanitize_and_decode_base64(
 
 
 def _validate_file_size(
-    decoded_data: bytes,
+    file_size: int,
     validation_result: dict[str, Any],
     strict: bool,
 ) -> bool:
     """Validate file size limits."""
-    file_size = len(decoded_data)
     validation_result["metadata"]["file_size_bytes"] = file_size
 
     if file_size > MAX_FILE_SIZE:
@@ -254,28 +359,30 @@ def _validate_image_structure(
     decoded_data: bytes,
     validation_result: dict[str, Any],
     strict: bool,
+    deep_decode: bool = False,
 ) -> bool:
     """Validate image format and structure."""
     try:
-        # Set decompression bomb protection
-        Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
-
         with io.BytesIO(decoded_data) as buffer:
             with Image.open(buffer) as img:
-                # Force image loading to detect corruption
-                img.load()
-
-                # Collect image metadata
+                # Collect image metadata (read from the header)
                 _collect_image_metadata(img, validation_result)
 
                 # Validate dimensions and pixel count
                 if not _validate_image_dimensions(img, validation_result, strict):
                     return False
 
+                # Detect corruption: a full pixel decode, or a cheaper
+                # structural check when the caller decodes afterwards
+                if deep_decode:
+                    img.load()
+                else:
+                    img.verify()
+
                 # Add format and quality warnings
                 _add_image_warnings(img, validation_result, len(decoded_data))
 
-    except OSError as e:
+    except (OSError, SyntaxError) as e:
         error = f"Cannot open image: {e!s}"
         validation_result["error"] = error
         validation_result["metadata"]["image_error"] = str(e)
@@ -421,6 +528,15 @@ def validate_prompt(prompt: str, strict: bool = True) -> dict[str, Any]:
         "sanitized_prompt": None,
     }
 
+    cache_key = (prompt, MAX_PROMPT_LENGTH) if isinstance(prompt, str) else None
+    if cache_key is not None:
+        with _prompt_cache_lock:
+            cached = _prompt_cache.get(cache_key)
+            if cached is not None:
+                _prompt_cache.move_to_end(cache_key)
+        if cached is not None:
+            return _copy_validation_result(cached)
+
     try:
         # Step 1: Basic input validation
         if not isinstance(prompt, str):
@@ -456,20 +572,24 @@ def validate_prompt(prompt: str, strict: bool = True) -> dict[str, Any]:
 
         # Step 3: Character encoding validation
         try:
-            # Normalize Unicode characters
-            normalized_prompt = unicodedata.normalize("NFKC", prompt)
+            # Normalize Unicode characters (ASCII text is already NFKC)
+            normalized_prompt = (
+                prompt if prompt.isascii() else unicodedata.normalize("NFKC", prompt)
+            )
             validation_result["sanitized_prompt"] = normalized_prompt
 
-            # Check for non-printable characters
-            non_printable = [
-                c
-                for c in normalized_prompt
-                if not c.isprintable() and c not in "\n\r\t"
-            ]
-            if non_printable:
-                validation_result["warnings"].append(
-                    f"Contains {len(non_printable)} non-printable characters",
+            # Check for non-printable characters; isprintable() settles the
+            # common case in C before falling back to a per-character count
+            if not normalized_prompt.isprintable():
+                non_printable = sum(
+                    1
+                    for c in normalized_prompt
+                    if not c.isprintable() and c not in "\n\r\t"
                 )
+                if non_printable:
+                    validation_result["warnings"].append(
+                        f"Contains {non_printable} non-printable characters",
+                    )
 
         except UnicodeError as e:
             error = f"Invalid character encoding: {e!s}"
@@ -513,10 +633,14 @@ def validate_prompt(prompt: str, strict: bool = True) -> dict[str, Any]:
                 "Detected potentially problematic regex patterns",
             )
 
-        # Check for excessive punctuation
-        punct_ratio = sum(
-            1 for c in sanitized if not c.isalnum() and not c.isspace()
-        ) / len(sanitized)
+        # Check for excessive punctuation; ASCII text is counted by deleting
+        # the punctuation bytes in one C pass
+        if sanitized.isascii():
+            kept = sanitized.encode("ascii").translate(None, ASCII_PUNCTUATION)
+            punct_count = len(sanitized) - len(kept)
+        else:
+            punct_count = len(PUNCTUATION_REGEX.findall(sanitized))
+        punct_ratio = punct_count / len(sanitized)
         if punct_ratio > 0.3:
             validation_result["warnings"].append(
                 "High punctuation ratio may impact parsing",
@@ -525,6 +649,12 @@ def validate_prompt(prompt: str, strict: bool = True) -> dict[str, Any]:
         validation_result["valid"] = True
         logger.debug(f"Prompt validation passed: {validation_result['metadata']}")
 
+        with _prompt_cache_lock:
+            _prompt_cache[cache_key] = _copy_validation_result(validation_result)
+            _prompt_cache.move_to_end(cache_key)
+            while len(_prompt_cache) > PROMPT_CACHE_SIZE:
+                _prompt_cache.popitem(last=False)
+
     except (
         SecurityValidationError,
         ResourceLimitError,
@@ -542,6 +672,21 @@ def validate_prompt(prompt: str, strict: bool = True) -> dict[str, Any]:
     return validation_result
 
 
+def _copy_validation_result(result: dict[str, Any]) -> dict[str, Any]:
+    """Copy a validation result so callers cannot mutate a cached entry."""
+    return {
+        **result,
+        "warnings": list(result["warnings"]),
+        "metadata": dict(result["metadata"]),
+    }
+
+
+def clear_prompt_validation_cache() -> None:
+    """Drop all cached prompt validation results."""
+    with _prompt_cache_lock:
+        _prompt_cache.clear()
+
+
 def validate_transform_parameters(
     transform_name: str,
     parameters: dict[str, Any],
@@ -664,7 +809,22 @@ def _validate_security(input_data: str, skip_length_check: bool = False) -> None
     if control_chars > len(input_data) * 0.1:  # More than 10% control chars
         raise SecurityValidationError("Excessive control characters detected")
 
+    # Check for suspicious fixed strings; lowercasing copies the input, so it
+    # is only done when a URL scheme is possible
+    if ":" in input_data:
+        lowered = input_data.lower()
+        for scheme in SUSPICIOUS_SCHEMES:
+            if scheme in lowered:
+                raise SecurityValidationError(
+                    f"Suspicious pattern detected: {scheme}",
+                )
+    for literal in SUSPICIOUS_LITERALS:
+        if literal in input_data:
+            raise SecurityValidationError(f"Suspicious pattern detected: {literal}")
+
     # Check for suspicious patterns with timeout protection
+    has_trigger = SUSPICIOUS_TRIGGER_REGEX.search(input_data) is not None
+    has_markup = "<" in input_data
     start_time = time.time()
     for pattern in SUSPICIOUS_REGEX:
         # Check if we're taking too long
@@ -672,6 +832,13 @@ def _validate_security(input_data: str, skip_length_check: bool = False) -> None
             logger.warning("Security validation timeout, skipping remaining patterns")
             break
 
+        # Skip patterns whose required characters are absent; markup patterns
+        # all start with "<"
+        if not has_trigger and pattern.pattern != SQL_KEYWORD_PATTERN:
+            continue
+        if not has_markup and pattern.pattern.startswith("<"):
+            continue
+
         try:
             if pattern.search(input_data):
                 raise SecurityValidationError(
@@ -739,22 +906,9 @@ def _estimate_memory_usage(metadata: dict[str, Any]) -> float:
 
 def _detect_redos_patterns(text: str) -> bool:
     """Detect patterns that might cause ReDoS attacks."""
-    # Look for nested quantifiers and excessive repetition
-    redos_patterns = [
-        r"(\w+)+",  # Nested quantifiers
-        r"(\d+)*",  # Nested quantifiers
-        r"(.+)+",  # Catastrophic backtracking
-        r"(.*)*",  # Catastrophic backtracking
-    ]
-
-    for pattern in redos_patterns:
-        try:
-            if re.search(pattern, text):
-                return True
-        except re.error:
-            continue
-
-    return False
+    # Look for nested quantifiers as literal regex source. Searching for them
+    # with re would run the very backtracking patterns we are warning about.
+    return any(pattern in text for pattern in REDOS_SUBSTRINGS)
 
 
 def get_validation_config() -> dict[str, Any]:
@@ -776,34 +930,42 @@ def create_safe_fallback_image() -> Image.Image:
     return Image.new("RGB", (100, 100), color="white")
 
 
+# Conservative parameters used when a transform's requested ones are unusable
+SAFE_DEFAULT_PARAMETERS: dict[str, dict[str, Any]] = {
+    "Blur": {"blur_limit": 3, "p": 0.5},
+    "GaussianBlur": {"blur_limit": 3, "p": 0.5},
+    "MotionBlur": {"blur_limit": 3, "p": 0.5},
+    "RandomBrightnessContrast": {
+        "brightness_limit": 0.1,
+        "contrast_limit": 0.1,
+        "p": 0.5,
+    },
+    "HueSaturationValue": {
+        "hue_shift_limit": 10,
+        "sat_shift_limit": 10,
+        "val_shift_limit": 10,
+        "p": 0.5,
+    },
+    "Rotate": {"limit": 15, "p": 0.5},
+    "HorizontalFlip": {"p": 0.5},
+    "VerticalFlip": {"p": 0.5},
+    "GaussNoise": {"var_limit": (5.0, 15.0), "p": 0.5},
+    "RandomCrop": {"height": 224, "width": 224, "p": 0.5},
+    "RandomResizedCrop": {"height": 224, "width": 224, "p": 0.5},
+    "Normalize": {"p": 1.0},
+    "CLAHE": {"clip_limit": 2.0, "tile_grid_size": (4, 4), "p": 0.5},
+}
+_FALLBACK_DEFAULT_PARAMETERS: dict[str, Any] = {"p": 0.5}
+
+
 def get_safe_default_parameters(transform_name: str) -> dict[str, Any]:
-    """Get safe default parameters for a transform."""
-    safe_defaults = {
-        "Blur": {"blur_limit": 3, "p": 0.5},
-        "GaussianBlur": {"blur_limit": 3, "p": 0.5},
-        "MotionBlur": {"blur_limit": 3, "p": 0.5},
-        "RandomBrightnessContrast": {
-            "brightness_limit": 0.1,
-            "contrast_limit": 0.1,
-            "p": 0.5,
-        },
-        "HueSaturationValue": {
-            "hue_shift_limit": 10,
-            "sat_shift_limit": 10,
-            "val_shift_limit": 10,
-            "p": 0.5,
-        },
-        "Rotate": {"limit": 15, "p": 0.5},
-        "HorizontalFlip": {"p": 0.5},
-        "VerticalFlip": {"p": 0.5},
-        "GaussNoise": {"var_limit": (5.0, 15.0), "p": 0.5},
-        "RandomCrop": {"height": 224, "width": 224, "p": 0.5},
-        "RandomResizedCrop": {"height": 224, "width": 224, "p": 0.5},
-        "Normalize": {"p": 1.0},
-        "CLAHE": {"clip_limit": 2.0, "tile_grid_size": (4, 4), "p": 0.5},
-    }
+    """Get safe default parameters for a transform.
 
-    return safe_defaults.get(transform_name, {"p": 0.5})
+    Returns a fresh copy, so callers may modify it freely.
+    """
+    return dict(
+        SAFE_DEFAULT_PARAMETERS.get(transform_name, _FALLBACK_DEFAULT_PARAMETERS),
+    )
 
 
 def validate_file_path(file_path: str, allowed_dirs: list[str] | None = None) -> str:
@@ -39,6 +39,22 @@ class GoogleGeminiClient(VLMClient):
           SDK examples for image-conditioned edits.
         - Returns the first inline image from the response as a PIL Image.
         """
+        prompt = _prompt_text(prompt_or_recipe)
+        # Follow working sample ordering [prompt, image], then retry [image, prompt]
+        return self._generate_content([[prompt, image], [image, prompt]])
+
+    def generate(
+        self,
+        prompt_or_recipe: dict[str, Any] | str,
+        *,
+        seed: int | None = None,
+        timeout: int | None = None,
+    ) -> Image.Image:
+        """Generate an image from the text prompt alone (no input image)."""
+        return self._generate_content([[_prompt_text(prompt_or_recipe)]])
+
+    def _generate_content(self, attempts: list[list[Any]]) -> Image.Image:
+        """Try each `contents` payload in order and return the first image."""
         try:
             # Lazy import so server can start without dependency installed
             from google import genai  # type: ignore
@@ -47,72 +63,69 @@ class GoogleGeminiClient(VLMClient):
                 "google-genai SDK not installed. Install with `pip install google-genai`"
             ) from e
 
-        prompt: str
-        if isinstance(prompt_or_recipe, str):
-            prompt = prompt_or_recipe
-        elif isinstance(prompt_or_recipe, dict) and "prompt" in prompt_or_recipe:
-            prompt = str(prompt_or_recipe.get("prompt", "")).strip()
-        else:
-            raise ValueError("prompt_or_recipe must be a string or dict with 'prompt'")
-
         # Construct client (api_key may be None; SDK will look to env if so)
         client = (
             genai.Client(api_key=self._api_key) if self._api_key else genai.Client()
         )
 
-        # Helper to extract first inline image from a response
-        def _extract_image(resp) -> Image.Image | None:
-            try:
-                for cand in getattr(resp, "candidates", []) or []:
-                    content = getattr(cand, "content", None)
-                    parts = getattr(content, "parts", None) if content else None
-                    if not parts:
-                        continue
-                    for part in parts:
-                        inline = getattr(part, "inline_data", None)
-                        if inline is not None and getattr(inline, "data", None):
-                            data = inline.data
-                            with BytesIO(data) as buf:
-                                img = Image.open(buf)
-                                img.load()
-                                return img
-            except Exception:
-                return None
-            return None
-
-        # Attempt 1: follow working sample ordering [prompt, image]
-        response = client.models.generate_content(
-            model=self.model,
-            contents=[prompt, image],
-        )
-        img = _extract_image(response)
-        if img is not None:
-            return img
-
-        # Attempt 2 (fallback): try [image, prompt]
-        response2 = client.models.generate_content(
-            model=self.model,
-            contents=[image, prompt],
-        )
-        img2 = _extract_image(response2)
-        if img2 is not None:
-            return img2
+        responses = []
+        for contents in attempts:
+            response = client.models.generate_content(
+                model=self.model,
+                contents=contents,
+            )
+            img = _extract_image(response)
+            if img is not None:
+                return img
+            responses.append(response)
 
         # Collect debug info to aid prompts/model tuning
-        def _summarize(resp) -> str:
-            try:
-                texts = []
-                for cand in getattr(resp, "candidates", []) or []:
-                    content = getattr(cand, "content", None)
-                    for part in getattr(content, "parts", []) or []:
-                        if getattr(part, "text", None):
-                            texts.append(part.text[:120])
-                return "; ".join(texts) if texts else ""
-            except Exception:
-                return ""
-
-        text_hint = _summarize(response) or _summarize(response2)
+        text_hint = next((h for h in map(_summarize, responses) if h), "")
         hint_msg = f" Hint: received text parts: {text_hint}" if text_hint else ""
         raise RuntimeError(
             "No image returned by Gemini model; check model name and prompt." + hint_msg
         )
+
+
+def _prompt_text(prompt_or_recipe: dict[str, Any] | str) -> str:
+    """Extract the text prompt from a prompt string or recipe dict."""
+    if isinstance(prompt_or_recipe, str):
+        return prompt_or_recipe
+    if isinstance(prompt_or_recipe, dict) and "prompt" in prompt_or_recipe:
+        return str(prompt_or_recipe.get("prompt", "")).strip()
+    raise ValueError("prompt_or_recipe must be a string or dict with 'prompt'")
+
+
+def _extract_image(resp) -> Image.Image | None:
+    """Extract the first inline image from a response."""
+    try:
+        for cand in getattr(resp, "candidates", []) or []:
+            content = getattr(cand, "content", None)
+            parts = getattr(content, "parts", None) if content else None
+            if not parts:
+                continue
+            for part in parts:
+                inline = getattr(part, "inline_data", None)
+                if inline is not None and getattr(inline, "data", None):
+                    data = inline.data
+                    with BytesIO(data) as buf:
+                        img = Image.open(buf)
+                        img.load()
+                        return img
+    except Exception:
+        return None
+    return None
+
+
+def _summarize(resp) -> str:
+    """Join the leading text parts of a response for error hints."""
+    try:
+        texts = []
+        for cand in getattr(resp, "candidates", []) or []:
+            content = getattr(cand, "content", None)
+            for part in getattr(content, "parts", []) or []:
+                if getattr(part, "text", None):
+                    texts.append(part.text[:120])
+        return "; ".join(texts) if texts else ""
+    except Exception:
+        return ""
@@ -6,6 +6,8 @@ that do not depend on external services: transforms, presets, status, quick-ref,
 and validate with a trivial prompt.
 """
 
+import io
+
 from examples.cli_demo import cli as demo_cli
 
 
@@ -27,3 +29,13 @@ def test_cli_quick_ref():
 
 def test_cli_validate():
     assert demo_cli.main(["validate", "--prompt", "add blur"]) == 0
+
+
+def test_cli_text_output_follows_stdout_encoding(monkeypatch):
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="cp1252")
+    monkeypatch.setattr("sys.stdout", stdout)
+
+    demo_cli._print_text("caf\u00e9 \u2705")
+    demo_cli._print_text("caf\u00e9 \u2705".encode())
+
+    assert stdout.buffer.getvalue() == "caf\u00e9 ?\n".encode("cp1252") * 2
@@ -4,19 +4,24 @@ This module tests the new file path functionality added to fix
 Claude base64 conversion crashes.
 """
 
+import asyncio
 import os
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 from PIL import Image
 
 from src.albumentations_mcp.server import (
+    _detect_image_source_type,
     _detect_input_mode,
     _load_image_from_input,
+    augment_image,
     get_pipeline_status,
     list_available_presets,
     list_available_transforms,
     load_image_for_processing,
+    mcp,
     set_default_seed,
     validate_mcp_request,
     validate_prompt,
@@ -62,6 +67,26 @@ class TestInputModeDetection:
         assert mode == ""
         assert "Provide only one of" in error
 
+    def test_image_source_type_detection(self):
+        """Test URL/base64/file classification of load_image_for_processing input."""
+        assert _detect_image_source_type("https://example.com/a.png") == "url"
+        assert _detect_image_source_type("data:image/png;base64,AAAA") == "base64"
+        assert _detect_image_source_type("iVBORw0KGgo+/" * 100 + "==") == "base64"
+        assert _detect_image_source_type("images/photo.jpg") == "file"
+
+    def test_long_path_detected_as_file(self, tmp_path, monkeypatch):
+        """Test paths whose first 128 chars look like base64 are still files."""
+        long_dir = "/".join(["segment" + "x" * 20] * 6)
+        assert len(long_dir) > 128
+        assert _detect_image_source_type(f"/data/{long_dir}/photo.jpg") == "file"
+
+        # No extension: recognised because the file exists
+        monkeypatch.chdir(tmp_path)
+        os.makedirs(long_dir)
+        Image.new("RGB", (8, 8)).save(f"{long_dir}/photo", format="PNG")
+        assert _detect_image_source_type(f"{long_dir}/photo") == "file"
+        assert _detect_image_source_type(f"{long_dir}/missing") == "base64"
+
 
 class TestImageLoading:
     """Test image loading from different input modes."""
@@ -267,6 +292,25 @@ class TestOutputDirectoryHandling:
         default_dir = os.getenv("OUTPUT_DIR", "outputs")
         assert default_dir == "outputs"
 
+    def test_output_dir_argument_does_not_touch_environment(self):
+        """augment_image writes to output_dir without mutating OUTPUT_DIR."""
+        with tempfile.TemporaryDirectory() as td:
+            img_path = Path(td) / "input.png"
+            Image.new("RGB", (32, 32), color=(90, 90, 90)).save(img_path)
+            out_dir = Path(td) / "custom"
+
+            with patch.dict(os.environ, {"OUTPUT_DIR": str(Path(td) / "env")}):
+                result = augment_image(
+                    image_path=str(img_path),
+                    prompt="add blur",
+                    output_dir=str(out_dir),
+                )
+                assert os.environ["OUTPUT_DIR"] == str(Path(td) / "env")
+
+            assert "✅" in result
+            assert str(out_dir) in result
+            assert not (Path(td) / "env").exists()
+
 
 class TestIntegrationWithExistingTools:
     """Test that other MCP tools still work correctly."""
@@ -285,6 +329,16 @@ class TestIntegrationWithExistingTools:
         assert "valid" in result
         assert "transforms" in result
 
+    def test_augment_image_tool_runs_off_event_loop(self):
+        """augment_image is registered as an async tool but stays callable."""
+        tool = mcp._tool_manager.get_tool("augment_image")
+        assert tool.is_async
+        assert "image_path" in tool.parameters["properties"]
+
+        result = asyncio.run(mcp.call_tool("augment_image", {"image_b64": "x"}))
+        assert "Either prompt or preset must be provided" in str(result)
+        assert "Either prompt or preset" in augment_image(image_b64="x")
+
     def test_get_pipeline_status_still_works(self):
         """Test that get_pipeline_status tool still works."""
         result = get_pipeline_status()
@@ -303,6 +357,10 @@ class TestIntegrationWithExistingTools:
         assert isinstance(result, dict)
         assert "presets" in result
         assert "total_count" in result
+        # Static registry: the payload is built once, each call gets a copy
+        again = list_available_presets()
+        assert again == result
+        assert again is not result
 
     def test_load_image_for_processing_still_works(self):
         """Test that load_image_for_processing tool still works."""
@@ -314,3 +372,23 @@ class TestIntegrationWithExistingTools:
         assert isinstance(result, str)
         assert "✅" in result  # Success message
         assert "Session ID:" in result
+
+    def test_load_image_for_processing_original_format(self):
+        """Opaque originals are stored as JPEG, alpha images stay PNG."""
+        with tempfile.TemporaryDirectory() as td:
+            with patch.dict(os.environ, {"OUTPUT_DIR": str(Path(td) / "out")}):
+                for mode, suffix in (("RGB", ".jpg"), ("RGBA", ".png")):
+                    img_path = Path(td) / f"{mode}.png"
+                    Image.new(mode, (16, 16)).save(img_path, format="PNG")
+                    result = load_image_for_processing(str(img_path))
+                    session_id = result.split("Session ID: ")[1].split("\n")[0]
+                    assert f"original_{session_id}{suffix}" in result
+
+                    image_b64, error = _load_image_from_input(
+                        "session",
+                        "",
+                        "",
+                        session_id,
+                    )
+                    assert error is None
+                    assert image_b64
@@ -464,6 +464,27 @@ class TestHookRegistryManagement:
         assert result.success is True
         assert execution_order == hook_names
 
+    @pytest.mark.asyncio
+    async def test_hook_registered_mid_stage_runs_next_time(self, clean_registry):
+        """Test a hook registered during a stage does not join that run."""
+        stage = HookStage.PRE_TRANSFORM
+        late_hook = MockHook("late_hook")
+
+        class RegisteringHook(BaseHook):
+            async def execute(self, context: HookContext) -> HookResult:
+                clean_registry.register_hook(stage, late_hook)
+                return HookResult(success=True, context=context)
+
+        clean_registry.register_hook(stage, RegisteringHook("registering_hook"))
+
+        context = HookContext(session_id="snapshot-test", original_prompt="test")
+        await clean_registry.execute_stage(stage, context)
+        assert late_hook.execution_count == 0
+
+        clean_registry.unregister_hook(stage, "registering_hook")
+        await clean_registry.execute_stage(stage, context)
+        assert late_hook.execution_count == 1
+
     @pytest.mark.asyncio
     async def test_dynamic_hook_registration(self, clean_registry):
         """Test dynamic hook registration during execution."""
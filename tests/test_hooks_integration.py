@@ -129,6 +129,59 @@ class TestPipelineIntegration:
         assert len(hooks["pre_mcp"]) > 0
         assert len(hooks["post_mcp"]) > 0
 
+    def test_default_hooks_not_registered_twice(self):
+        """Re-creating the pipeline does not duplicate default hooks."""
+        AugmentationPipeline()
+        before = get_hook_registry().list_hooks()
+        AugmentationPipeline()
+        after = get_hook_registry().list_hooks()
+
+        assert after == before
+        assert after["pre_mcp"].count("pre_mcp_sanitization") == 1
+
+    @pytest.mark.asyncio
+    async def test_repeat_prompt_uses_parse_cache(self):
+        """Repeat prompts reuse the cached parse but get fresh session ids."""
+        pipeline = AugmentationPipeline()
+        first = await pipeline.parse_prompt_with_hooks("add blur", "session-a")
+        second = await pipeline.parse_prompt_with_hooks("  Add Blur ", "session-b")
+
+        assert second["success"] is True
+        assert second["transforms"] == first["transforms"]
+        assert second["session_id"] == "session-b"
+        assert second["metadata"]["json_spec"]["session_id"] == "session-b"
+
+        # Cached copies are isolated from caller mutation
+        second["transforms"][0]["parameters"]["p"] = 0.0
+        third = await pipeline.parse_prompt_with_hooks("add blur", "session-c")
+        assert third["transforms"] == first["transforms"]
+
+    @pytest.mark.asyncio
+    async def test_parse_cache_hit_keeps_callers_prompt_metadata(self):
+        """Equivalent prompts share the parse but report their own prompt."""
+        pipeline = AugmentationPipeline()
+        await pipeline.parse_prompt_with_hooks("Add BLUR and rotate!")
+        second = await pipeline.parse_prompt_with_hooks("add blur and rotate")
+
+        assert len(pipeline._parse_cache) == 1
+        metadata = second["metadata"]
+        json_spec = metadata["json_spec"]
+        assert json_spec["original_prompt"] == "add blur and rotate"
+        assert metadata["prompt_length"] == len("add blur and rotate")
+        assert json_spec["metadata"]["prompt_length"] == metadata["prompt_length"]
+
+    @pytest.mark.asyncio
+    async def test_parse_cache_key_normalizes_prompt(self):
+        """Whitespace, case and trailing punctuation share one cache entry."""
+        pipeline = AugmentationPipeline()
+        await pipeline.parse_prompt_with_hooks("Add blur and   rotate by 30 degrees")
+        await pipeline.parse_prompt_with_hooks("add blur and rotate by 30 degrees.")
+        assert len(pipeline._parse_cache) == 1
+
+        # Clause order changes transform order, so it is a different entry
+        await pipeline.parse_prompt_with_hooks("rotate by 30 degrees and add blur")
+        assert len(pipeline._parse_cache) == 2
+
 
 class TestMCPToolsWithHooks:
     """Test MCP tools with hook integration."""
@@ -1,7 +1,9 @@
 """Unit tests for image handling utilities."""
 
 import base64
+import binascii
 import io
+from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pytest
@@ -13,16 +15,21 @@ from src.albumentations_mcp.errors import (
 )
 from src.albumentations_mcp.image_conversions import (
     base64_to_pil,
+    clear_image_cache,
     numpy_to_pil,
     pil_to_base64,
     pil_to_numpy,
 )
 from src.albumentations_mcp.utils.image_handler import (
+    MAX_FILE_SIZE,
     MAX_IMAGE_SIZE,
     SUPPORTED_FORMATS,
+    _fetch_url_bytes,
+    b64decode,
     get_image_info,
     get_supported_formats,
     is_supported_format,
+    load_image_from_source,
     validate_image,
 )
 
@@ -79,6 +86,72 @@ class TestBase64ToPil:
         converted = base64_to_pil(base64_data)
         assert converted.mode == "RGB"
 
+    def test_repeated_decode_returns_independent_copies(self):
+        """Test cached decodes are reused without sharing pixel data."""
+        clear_image_cache()
+        base64_data, _ = self.create_test_image()
+
+        first = base64_to_pil(base64_data)
+        first.putpixel((0, 0), (0, 0, 255))
+        with patch(
+            "src.albumentations_mcp.utils.image_handler.load_image_safely",
+        ) as load:
+            second = base64_to_pil(base64_data)
+
+        load.assert_not_called()
+        assert second.getpixel((0, 0)) == (255, 0, 0)
+
+    def test_repeated_decode_keeps_source_format(self):
+        """Test cached decodes report the same format as a fresh decode."""
+        clear_image_cache()
+        base64_data, _ = self.create_test_image(fmt="JPEG")
+
+        first = base64_to_pil(base64_data)
+        second = base64_to_pil(base64_data)
+
+        assert first.format == "JPEG"
+        assert second.format == "JPEG"
+
+    def test_large_decode_is_not_cached(self):
+        """Test images above the per-entry cap are decoded every time."""
+        clear_image_cache()
+        base64_data, _ = self.create_test_image()
+
+        # 100x100 RGB decodes to 30,000 bytes
+        with patch(
+            "src.albumentations_mcp.image_conversions.IMAGE_CACHE_MAX_ENTRY_BYTES",
+            29_999,
+        ):
+            base64_to_pil(base64_data)
+            with patch(
+                "src.albumentations_mcp.utils.image_handler.load_image_safely",
+                side_effect=ImageConversionError("decoded again"),
+            ):
+                with pytest.raises(ImageConversionError, match="decoded again"):
+                    base64_to_pil(base64_data)
+
+    def test_cache_evicts_to_byte_budget(self):
+        """Test the oldest decodes are evicted once the byte budget is full."""
+        clear_image_cache()
+        first_b64, _ = self.create_test_image()
+        second_b64, _ = self.create_test_image(size=(60, 60))
+
+        # Room for the 30,000-byte image or the 10,800-byte one, not both
+        with patch(
+            "src.albumentations_mcp.image_conversions.IMAGE_CACHE_MAX_BYTES",
+            35_000,
+        ):
+            base64_to_pil(first_b64)
+            base64_to_pil(second_b64)
+            with patch(
+                "src.albumentations_mcp.utils.image_handler.load_image_safely",
+                side_effect=ImageConversionError("decoded again"),
+            ):
+                assert base64_to_pil(second_b64).size == (60, 60)
+                with pytest.raises(ImageConversionError, match="decoded again"):
+                    base64_to_pil(first_b64)
+        clear_image_cache()
+
     def test_empty_string_error(self):
         """Test error handling for empty string."""
         with pytest.raises(ImageConversionError, match="must be a non-empty string"):
@@ -120,6 +193,15 @@ class TestBase64ToPil:
         ):
             base64_to_pil(base64_data)
 
+    def test_b64decode_matches_stdlib(self):
+        """b64decode returns stdlib-identical bytes and errors with either codec."""
+        raw = bytes(range(256))
+        encoded = base64.b64encode(raw).decode("ascii")
+        assert b64decode(encoded, validate=True) == raw
+
+        with pytest.raises(binascii.Error):
+            b64decode("not*base64", validate=True)
+
 
 class TestPilToBase64:
     """Test PIL Image to base64 conversion."""
@@ -160,6 +242,16 @@ class TestPilToBase64:
         # Low quality should result in smaller file size
         assert len(low_quality) < len(high_quality)
 
+    def test_fast_png_is_lossless(self):
+        """Test fast PNG encoding round-trips pixels exactly."""
+        image = Image.fromarray(
+            np.random.randint(0, 256, (64, 64, 3), dtype=np.uint8),
+        )
+
+        converted_back = base64_to_pil(pil_to_base64(image, fast=True))
+
+        assert np.array_equal(np.asarray(converted_back), np.asarray(image))
+
     def test_rgba_to_jpeg_conversion(self):
         """Test RGBA image conversion to JPEG (should handle transparency)."""
         image = self.create_test_image(mode="RGBA")
@@ -445,6 +537,49 @@ class TestIntegration:
         # but they should be very close
         assert np.allclose(restored_array, array, atol=1)
 
+    def test_load_large_base64_source(self):
+        """Base64 sources longer than PATH_MAX are not probed as file paths."""
+        array = np.random.randint(0, 256, (64, 64, 3), dtype=np.uint8)
+        base64_data = pil_to_base64(Image.fromarray(array), format="PNG")
+        assert len(base64_data) > 4096
+
+        image = load_image_from_source(base64_data)
+
+        assert image.size == (64, 64)
+
+    def test_url_source_rejects_oversized_content_length(self):
+        """URL downloads are refused before reading when too large."""
+        response = MagicMock()
+        response.headers = {"Content-Length": str(MAX_FILE_SIZE + 1)}
+        response.__enter__.return_value = response
+
+        with patch("urllib.request.urlopen", return_value=response):
+            with pytest.raises(ImageConversionError, match="too large"):
+                load_image_from_source("https://example.com/big.png")
+
+        response.read.assert_not_called()
+
+    def test_url_source_bytes_are_cached(self):
+        """Repeated loads of one URL download it once and return fresh images."""
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8), color="blue").save(buffer, format="PNG")
+        response = MagicMock()
+        response.headers = {}
+        response.read.return_value = buffer.getvalue()
+        response.__enter__.return_value = response
+        _fetch_url_bytes.cache_clear()
+
+        try:
+            with patch("urllib.request.urlopen", return_value=response) as urlopen:
+                first = load_image_from_source("https://example.com/cached.png")
+                second = load_image_from_source("https://example.com/cached.png")
+        finally:
+            _fetch_url_bytes.cache_clear()
+
+        assert urlopen.call_count == 1
+        assert first is not second
+        assert first.size == second.size == (8, 8)
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
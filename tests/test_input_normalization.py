@@ -30,6 +30,15 @@ def test_file_path_resize(tmp_path):
     assert isinstance(b64, str) and len(b64) > 0
 
 
+def test_file_path_within_limits_passes_bytes_through(tmp_path):
+    _, raw = _mk_img(64, 48)
+    p = tmp_path / "small.jpg"
+    p.write_bytes(raw)
+    b64, err = _load_and_preprocess_from_file(str(p))
+    assert err is None
+    assert base64.b64decode(b64) == raw
+
+
 def test_base64_resize_permissive():
     _, raw = _mk_img()
     b64_in = _to_b64(raw)
@@ -38,6 +47,39 @@ def test_base64_resize_permissive():
     assert isinstance(b64_out, str) and len(b64_out) > 0
 
 
+def test_base64_within_limits_passes_through():
+    _, raw = _mk_img(64, 48)
+    b64_in = _to_b64(raw)
+    b64_out, err = _load_and_preprocess_from_base64(f"data:image/jpeg;base64,{b64_in}")
+    assert err is None
+    assert b64_out == b64_in
+
+
 def test_base64_invalid():
     b64, err = _load_and_preprocess_from_base64("not_base64")
     assert err and "B64_INVALID" in err
+
+
+def test_base64_over_byte_cap_is_reencoded(monkeypatch):
+    _, raw = _mk_img(64, 48)
+    monkeypatch.setattr(
+        "albumentations_mcp.server.get_max_bytes_in", lambda: len(raw) - 1
+    )
+    b64_out, err = _load_and_preprocess_from_base64(_to_b64(raw))
+    assert err is None
+    assert b64_out != _to_b64(raw)
+    assert Image.open(io.BytesIO(base64.b64decode(b64_out))).size == (64, 48)
+
+
+def test_base64_corrupted_image_is_not_passed_through():
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 48), (10, 20, 30)).save(buf, format="PNG")
+    raw = bytearray(buf.getvalue())
+    # Flip a byte inside the IDAT payload so its CRC no longer matches
+    idat = raw.index(b"IDAT")
+    raw[idat + 6] ^= 0xFF
+    b64_in = _to_b64(bytes(raw))
+    b64_out, err = _load_and_preprocess_from_base64(b64_in)
+    # Falls back to the full decode: rejected, or re-encoded from pixels
+    assert b64_out != b64_in
+    assert b64_out is not None or "B64_INVALID" in err
@@ -181,6 +181,18 @@ class TestMCPClientCompatibility:
         assert isinstance(seed_result, dict)
         json.dumps(seed_result)
 
+    def test_listing_tools_return_independent_payloads(self):
+        """Mutating a listing response must not leak into later responses."""
+        presets = list_available_presets()
+        count = presets["total_count"]
+        presets["presets"].clear()
+        assert len(list_available_presets()["presets"]) == count
+
+        transforms = list_available_transforms()
+        transforms["transforms"][0]["parameters"]["injected"] = True
+        fresh = list_available_transforms()
+        assert "injected" not in fresh["transforms"][0]["parameters"]
+
 
 class TestFilePathModeSpecific:
     """Test file path mode specific functionality."""
@@ -2,12 +2,14 @@
 
 from unittest.mock import Mock, patch
 
+import numpy as np
 from PIL import Image
 
 from src.albumentations_mcp.processor import (
     ImageProcessor,
     ProcessingError,
     ProcessingResult,
+    _spec_key,
     get_processor,
     process_image,
 )
@@ -107,6 +109,78 @@ class TestImageProcessor:
         assert result.success is True
         assert len(result.skipped_transforms) >= 1
 
+    def test_process_image_ndarray_input_and_output(self):
+        """Arrays can be processed without a PIL round-trip."""
+        processor = ImageProcessor()
+        array = np.zeros((40, 60, 3), dtype=np.uint8)
+        array[:, :10] = 255
+        transforms = [{"name": "HorizontalFlip", "parameters": {"p": 1.0}}]
+
+        result = processor.process_image(array, transforms, output_format="ndarray")
+
+        assert result.success is True
+        assert isinstance(result.augmented_image, np.ndarray)
+        assert result.augmented_image.shape == (40, 60, 3)
+        assert (result.augmented_image[:, -10:] == 255).all()
+        assert result.metadata["original_size"] == (60, 40)
+        assert result.metadata["output_size"] == (60, 40)
+
+        # Default output is still a PIL image
+        result = processor.process_image(array, transforms)
+        assert isinstance(result.augmented_image, Image.Image)
+        assert result.augmented_image.size == (60, 40)
+
+    def test_process_image_2d_array_keeps_shape(self):
+        """A 2D (H, W) array comes back 2D with or without transforms."""
+        processor = ImageProcessor()
+        array = np.zeros((40, 60), dtype=np.uint8)
+        array[:, :10] = 255
+
+        flipped = processor.process_image(
+            array,
+            [{"name": "HorizontalFlip", "parameters": {"p": 1.0}}],
+            output_format="ndarray",
+        )
+        assert flipped.augmented_image.shape == (40, 60)
+        assert (flipped.augmented_image[:, -10:] == 255).all()
+
+        unchanged = processor.process_image(array, [], output_format="ndarray")
+        assert unchanged.augmented_image.shape == (40, 60)
+
+        batch = processor.process_batch(
+            [array, array.copy()],
+            [{"name": "HorizontalFlip", "parameters": {"p": 1.0}}],
+            output_format="ndarray",
+        )
+        assert [r.augmented_image.shape for r in batch] == [(40, 60), (40, 60)]
+
+    def test_process_batch(self):
+        """Same-sized images are augmented together, mixed sizes fall back."""
+        processor = ImageProcessor()
+        array = np.zeros((32, 48, 3), dtype=np.uint8)
+        array[:, :8] = 255
+        transforms = [{"name": "HorizontalFlip", "parameters": {"p": 1.0}}]
+
+        results = processor.process_batch(
+            [array, array.copy(), Image.fromarray(array)],
+            transforms,
+            seed=3,
+            output_format="ndarray",
+        )
+
+        assert len(results) == 3
+        for result in results:
+            assert result.success is True
+            assert result.metadata["batch_size"] == 3
+            assert (result.augmented_image[:, -8:] == 255).all()
+
+        mixed = processor.process_batch(
+            [self.test_image, Image.new("RGB", (20, 10))],
+            transforms,
+        )
+        assert [r.augmented_image.size for r in mixed] == [(100, 100), (20, 10)]
+        assert processor.process_batch([], transforms) == []
+
     def test_process_image_with_seed(self):
         """Test processing image with seed for reproducibility."""
         processor = ImageProcessor()
@@ -161,6 +235,19 @@ class TestImageProcessor:
 
         assert transform is None
 
+    def test_create_transform_drops_unaccepted_parameters(self):
+        """Arguments outside the transform signature are not passed through."""
+        processor = ImageProcessor()
+        transform_spec = {
+            "name": "Blur",
+            "parameters": {"blur_limit": 5, "p": 1.0, "not_a_param": 3},
+        }
+
+        transform = processor._create_transform(transform_spec)
+
+        assert transform is not None
+        assert transform.p == 1.0
+
     def test_create_transform_cached(self):
         """Test transform caching functionality."""
         processor = ImageProcessor()
@@ -385,12 +472,25 @@ class TestErrorHandling:
 
         processor = ImageProcessor()
         test_image = Image.new("RGB", (100, 100), color="red")
+        transforms = [{"name": "HorizontalFlip", "parameters": {"p": 1.0}}]
 
-        result = processor.process_image(test_image, [])
+        result = processor.process_image(test_image, transforms)
 
         assert result.success is False
         assert "Conversion failed" in result.error_message
 
+    @patch("src.albumentations_mcp.processor.pil_to_numpy")
+    def test_no_op_pipeline_skips_conversion(self, mock_pil_to_numpy):
+        """Images are not converted when there is nothing to apply."""
+        processor = ImageProcessor()
+        test_image = Image.new("RGB", (100, 100), color="red")
+
+        result = processor.process_image(test_image, [])
+
+        assert result.success is True
+        assert result.augmented_image is test_image
+        mock_pil_to_numpy.assert_not_called()
+
     def test_transform_recovery_integration(self):
         """Test integration with transform recovery system."""
         processor = ImageProcessor()
@@ -441,3 +541,47 @@ class TestPerformanceOptimizations:
         assert pipeline1 is not None
         assert pipeline2 is not None
         # Both should work but may be different instances due to seeding
+
+    def test_cached_pipeline_is_reseeded_and_order_aware(self):
+        """Cached pipelines stay reproducible and keep transform order."""
+        processor = ImageProcessor()
+        image = Image.new("RGB", (64, 48), color="red")
+        image.paste((0, 0, 255), (0, 0, 20, 20))
+        transforms = [
+            {"name": "Rotate", "parameters": {"limit": 45, "p": 1.0}},
+            {"name": "HorizontalFlip", "parameters": {"p": 1.0}},
+        ]
+
+        first = processor.process_image(image, transforms, seed=7)
+        processor.process_image(image, transforms, seed=8)
+        again = processor.process_image(image, transforms, seed=7)
+
+        assert len(processor._pipeline_cache) == 1
+        assert first.augmented_image.tobytes() == again.augmented_image.tobytes()
+
+        processor._create_pipeline(list(reversed(transforms)))
+        assert len(processor._pipeline_cache) == 2
+
+    def test_pipeline_cache_is_per_thread(self):
+        """Threads never share a cached pipeline that another may reseed."""
+        import threading
+
+        processor = ImageProcessor()
+        transforms = [{"name": "HorizontalFlip", "parameters": {"p": 1.0}}]
+        main_pipeline, _ = processor._create_pipeline(transforms, seed=1)
+
+        worker_pipelines = []
+        worker = threading.Thread(
+            target=lambda: worker_pipelines.append(
+                processor._create_pipeline(transforms, seed=2)[0],
+            ),
+        )
+        worker.start()
+        worker.join()
+
+        assert worker_pipelines[0] is not main_pipeline
+        assert processor._create_pipeline(transforms, seed=1)[0] is main_pipeline
+
+    def test_spec_key_distinguishes_dict_from_pair_list(self):
+        """A dict parameter and an equivalent list of pairs get different keys."""
+        assert _spec_key({"a": 1}) != _spec_key([("a", 1)])
@@ -1,5 +1,6 @@
 """Tests for the common utilities module."""
 
+import asyncio
 import os
 import tempfile
 import time
@@ -18,6 +19,7 @@ from src.albumentations_mcp.utils import (
     handle_exception_with_fallback,
     log_with_context,
     normalize_whitespace,
+    run_async_safely,
     safe_execute,
     safe_file_operation,
     sanitize_filename,
@@ -344,6 +346,65 @@ class TestTimingUtilities:
         with pytest.raises(ValueError):
             failing_function()
 
+    def test_run_async_safely_with_and_without_running_loop(self):
+        """Coroutines run both from plain code and from inside a running loop."""
+
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        assert run_async_safely(add, 1, 2) == 3
+
+        async def caller():
+            return run_async_safely(add, 3, 4)
+
+        assert asyncio.run(caller()) == 7
+
+    def test_run_async_safely_reuses_one_loop(self):
+        """Successive calls from one thread share that thread's loop."""
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = run_async_safely(current_loop)
+        assert run_async_safely(current_loop) is first
+        assert not first.is_closed()
+
+    def test_run_async_safely_threads_run_concurrently(self):
+        """Blocking coroutines from different threads do not queue up."""
+        import threading
+
+        barrier = threading.Barrier(2, timeout=5)
+        results = []
+
+        async def meet():
+            # Blocks the loop; only passes if the other thread's call
+            # is running at the same time on a different loop
+            barrier.wait()
+            return True
+
+        def call():
+            results.append(run_async_safely(meet))
+
+        threads = [threading.Thread(target=call) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [True, True]
+
+    def test_run_async_safely_nested_call(self):
+        """A coroutine run by the helper can itself use the helper."""
+
+        async def inner():
+            return "inner"
+
+        async def outer():
+            return run_async_safely(inner)
+
+        assert run_async_safely(outer) == "inner"
+
 
 class TestStringUtilities:
     """Test string and text utilities."""
@@ -4,7 +4,7 @@ import base64
 import io
 
 import pytest
-from PIL import Image
+from PIL import Image, ImageFile
 
 import src.albumentations_mcp.validation as v
 from src.albumentations_mcp.validation import (
@@ -120,6 +120,72 @@ class TestImageValidation:
         assert result["valid"] is False
         assert "too large" in result["error"]  # Could be security or file size limit
 
+    def test_file_size_checked_before_decode(self, monkeypatch):
+        """Oversized payloads are rejected from their length, before decoding."""
+        image_b64 = self.create_test_image()
+        monkeypatch.setattr(v, "MAX_FILE_SIZE", 10)
+
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("payload should not be decoded")
+
+        monkeypatch.setattr(v, "b64decode", fail_decode)
+        result = validate_base64_image(image_b64, strict=False)
+
+        assert result["valid"] is False
+        assert "too large" in result["error"]
+        assert result["metadata"]["file_size_bytes"] == len(
+            base64.b64decode(image_b64),
+        )
+
+    def test_file_size_checked_before_security_scan(self, monkeypatch):
+        """Oversized payloads are rejected before the security scan runs."""
+        image_b64 = self.create_test_image()
+        monkeypatch.setattr(v, "MAX_FILE_SIZE", 10)
+
+        def fail_scan(*args, **kwargs):
+            raise AssertionError("payload should not be scanned")
+
+        monkeypatch.setattr(v, "_validate_security", fail_scan)
+        result = validate_base64_image(image_b64, strict=False)
+
+        assert result["valid"] is False
+        assert "too large" in result["error"]
+
+    def test_size_precheck_ignores_data_url_header_and_whitespace(self, monkeypatch):
+        """A payload exactly at the size limit is not rejected by the pre-check."""
+        image_b64 = self.create_test_image()
+        monkeypatch.setattr(v, "MAX_FILE_SIZE", len(base64.b64decode(image_b64)))
+
+        result = validate_base64_image(
+            f"data:image/png;base64,{image_b64}\n\n",
+            strict=False,
+        )
+
+        assert result["valid"] is True
+
+    def test_decoded_data_returned(self):
+        """Valid images expose their decoded bytes for reuse by callers."""
+        image_b64 = self.create_test_image()
+        result = validate_base64_image(image_b64, strict=False)
+
+        assert result["valid"] is True
+        assert result["decoded_data"] == base64.b64decode(image_b64)
+
+    def test_deep_decode_is_opt_in(self, monkeypatch):
+        """Pixels are only decoded when deep_decode is requested."""
+        image_b64 = self.create_test_image()
+
+        def fail_load(self):
+            raise OSError("pixel decode attempted")
+
+        monkeypatch.setattr(ImageFile.ImageFile, "load", fail_load)
+        shallow = validate_base64_image(image_b64, strict=False)
+        deep = validate_base64_image(image_b64, strict=False, deep_decode=True)
+
+        assert shallow["valid"] is True
+        assert deep["valid"] is False
+        assert "pixel decode attempted" in deep["error"]
+
     def test_unsupported_format(self):
         """Test handling of unsupported image format."""
         # This test is tricky since PIL supports most formats
@@ -168,6 +234,19 @@ class TestPromptValidation:
         assert result["error"] is None
         assert result["sanitized_prompt"] == "add blur and increase contrast"
 
+    def test_valid_prompt_cached(self):
+        """Repeat validations return equal, independent copies."""
+        v.clear_prompt_validation_cache()
+        first = validate_prompt("add blur and rotate", strict=False)
+        first["warnings"].append("caller mutation")
+
+        second = validate_prompt("add blur and rotate", strict=False)
+
+        assert second["valid"] is True
+        assert "caller mutation" not in second["warnings"]
+        assert second["metadata"] == first["metadata"]
+        assert second is not first
+
     def test_empty_prompt(self):
         """Test validation of empty prompt."""
         result = validate_prompt("", strict=False)
@@ -227,6 +306,24 @@ class TestPromptValidation:
             assert result["valid"] is False
             assert result["error"] is not None
 
+    def test_redos_pattern_warning(self):
+        """Only prompts containing nested-quantifier regex source are flagged."""
+        warning = "Detected potentially problematic regex patterns"
+
+        result = validate_prompt("add blur and rotate", strict=False)
+        assert warning not in result["warnings"]
+
+        result = validate_prompt("add blur (a+)+", strict=False)
+        assert result["valid"] is True
+        assert warning in result["warnings"]
+
+    def test_sql_keywords_flagged_without_trigger_characters(self):
+        """The letters-only SQL pattern still runs when no trigger is present."""
+        result = validate_prompt("drop table users", strict=False)
+
+        assert result["valid"] is False
+        assert "Suspicious pattern" in result["error"]
+
     def test_excessive_punctuation(self):
         """Test detection of excessive punctuation."""
         # Use punctuation that doesn't trigger security patterns
@@ -255,6 +352,17 @@ class TestPromptValidation:
         with pytest.raises(SecurityValidationError):
             validate_prompt("<script>alert('xss')</script>", strict=True)
 
+    def test_long_script_body_is_flagged(self):
+        """Script tags are caught even when the body is long."""
+        with pytest.raises(SecurityValidationError):
+            validate_prompt("<script>" + "a" * 1500 + "</script>", strict=True)
+
+    def test_script_body_up_to_prompt_limit_is_flagged(self):
+        """Script bodies longer than any fixed bound but within a prompt are caught."""
+        body = "a" * (v.MAX_PROMPT_LENGTH - len("<script></script>"))
+        with pytest.raises(SecurityValidationError):
+            validate_prompt(f"<script>{body}</script>", strict=True)
+
 
 class TestParameterValidation:
     """Test transform parameter validation."""